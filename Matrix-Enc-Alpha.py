@@ -6,27 +6,68 @@ Tüm özellikler entegre edilmiş versiyon
 import pygame
 import random
 import math
+import os
 import sys
 import json
+import struct
+import mmap
+import pickle
+import io
+import hashlib
+import time
+import gc
+import platform
 import numpy as np
 import datetime
 import threading
 import socket
+import contextlib
+import logging
+import logging.handlers
+import tracemalloc
+from collections import OrderedDict, deque
 from enum import Enum
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 from pygame import gfxdraw
 
+# Başsız mod: pencere ve ses olmadan, SDL dummy sürücüsüyle
+HEADLESS = '--headless' in sys.argv or os.environ.get('MATRIX_HEADLESS') == '1'
+# Kıyaslama modu: pencere yok ama çizim yine de ölçülür
+BENCHMARK = '--bench' in sys.argv
+if HEADLESS or BENCHMARK:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
 # PyGame başlatma
 pygame.init()
 pygame.mixer.init()
 
 # Ekran ayarları
 WIDTH, HEIGHT = 1400, 900
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE)
+if HEADLESS or BENCHMARK:
+    # convert()/convert_alpha() için yine de bir görüntü yüzeyi gerekir
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+else:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE)
 pygame.display.set_caption("THE MATRIX: DIGITAL REVOLUTION")
 clock = pygame.time.Clock()
 
+def set_resolution(width, height, headless=HEADLESS):
+    # Pencere yeniden boyutlanınca ekran yüzeyi ve yüzey havuzu yenilenir
+    global WIDTH, HEIGHT, screen
+    WIDTH, HEIGHT = width, height
+    if not headless:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE)
+    surface_pool.clear()
+
+# Simülasyon sabit adımla ilerler, çizim hızı ayrı sınırlanır
+TICK_RATE = 60
+MAX_CATCH_UP_TICKS = 5
+MAX_RENDER_FPS = 240
+# Bu süreyi aşan kareler takılma sayılır (iki 60 Hz karesi)
+HITCH_BUDGET_MS = 2000.0 / TICK_RATE
+
 # Renk paleti - Genişletilmiş
 COLORS = {
     'matrix_green': (0, 255, 0),
@@ -62,6 +103,218 @@ large_font = pygame.font.Font(None, 72)
 medium_font = pygame.font.Font(None, 36)
 small_font = pygame.font.Font(None, 14)
 
+# ==================== GLYPH ATLAS ====================
+class GlyphAtlas:
+    def __init__(self, glyph_font, chars=MATRIX_CHARS, max_tints=4096):
+        self.font = glyph_font
+        self.glyphs = {}
+        self.tints = OrderedDict()
+        self.max_tints = max_tints
+
+        # Karakterleri bir kez beyaz olarak rasterize et
+        for char in chars:
+            self.glyphs[char] = self.rasterize(char)
+
+    def rasterize(self, char):
+        glyph = self.font.render(char, True, COLORS['matrix_white'])
+        if pygame.display.get_surface() is not None:
+            glyph = glyph.convert_alpha()
+        return glyph
+
+    def glyph(self, char, color):
+        key = (char, color[0], color[1], color[2])
+        tinted = self.tints.get(key)
+        if tinted is not None:
+            self.tints.move_to_end(key)
+            return tinted
+
+        # Sınır aşılınca en uzun süredir kullanılmayan boya atılır
+        tinted = self.tints[key] = self.tint(char, color)
+        if len(self.tints) > self.max_tints:
+            self.tints.popitem(last=False)
+        return tinted
+
+    def tint(self, char, color):
+        base = self.glyphs.get(char)
+        if base is None:
+            # Set dışındaki karakterler ('·' gibi) ilk kullanımda eklenir
+            base = self.glyphs[char] = self.rasterize(char)
+
+        # Beyaz glifi renkle çarparak boya
+        tinted = base.copy()
+        tinted.fill((color[0], color[1], color[2], 255), special_flags=pygame.BLEND_RGBA_MULT)
+        return tinted
+
+    def blit(self, surface, char, color, pos, alpha=255):
+        glyph = self.glyph(char, color)
+        glyph.set_alpha(alpha)
+        return surface.blit(glyph, pos)
+
+class FontCache:
+    def __init__(self, capacity=12, quantum=2):
+        self.capacity = capacity
+        self.quantum = quantum
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, size):
+        return max(self.quantum, int(round(size / self.quantum)) * self.quantum)
+
+    def atlas(self, size):
+        key = self.quantize(size)
+        atlas = self.entries.get(key)
+        if atlas is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return atlas
+
+        # Font sadece önbellekte olmayan boyut için oluşturulur
+        self.misses += 1
+        atlas = self.entries[key] = GlyphAtlas(pygame.font.Font(None, key))
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return atlas
+
+    def font(self, size):
+        return self.atlas(size).font
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+class RotatedGlyphCache:
+    def __init__(self, atlas, steps=32, capacity=2048):
+        self.atlas = atlas
+        self.steps = steps
+        self.step_angle = 360.0 / steps
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, char, color, angle):
+        # Açı en yakın adıma yuvarlanır
+        step = int(angle / self.step_angle + 0.5) % self.steps
+        key = (char, color[0], color[1], color[2], step)
+        rotated = self.entries.get(key)
+        if rotated is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return rotated
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(self.atlas.glyph(char, color), step * self.step_angle)
+        self.entries[key] = rotated
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return rotated
+
+glyph_atlas = GlyphAtlas(font)
+small_glyph_atlas = GlyphAtlas(small_font)
+
+# Matrix parçacıklarının döndürülmüş glifleri
+rotated_glyphs = RotatedGlyphCache(small_glyph_atlas)
+
+# Hava durumu parçacıklarının boyutlu metni için
+weather_font_cache = FontCache()
+
+# ==================== SURFACE POOL ====================
+class SurfacePool:
+    def __init__(self):
+        self.surfaces = {}
+        self.allocations = 0
+
+    def get(self, tag, size, flags=0):
+        key = (tag, size, flags)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, flags)
+            # Ekranın yerel formatına çevir, blit sırasında dönüşüm olmasın
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha() if flags & pygame.SRCALPHA else surface.convert()
+            self.surfaces[key] = surface
+            self.allocations += 1
+        return surface
+
+    def filled(self, color, size):
+        # Sabit renkli katmanlar bir kez doldurulur ve paylaşılır
+        tag = ('filled', color)
+        surface = self.surfaces.get((tag, size, pygame.SRCALPHA))
+        if surface is None:
+            surface = self.get(tag, size, pygame.SRCALPHA)
+            surface.fill(color)
+        return surface
+
+    def clear(self):
+        # VIDEORESIZE sonrası eski boyuttaki yüzeyler bırakılır
+        self.surfaces.clear()
+
+    def live_bytes(self):
+        return sum(surface.get_pitch() * surface.get_height() for surface in self.surfaces.values())
+
+    def stats(self):
+        return {
+            'surfaces': len(self.surfaces),
+            'allocations': self.allocations,
+            'live_bytes': self.live_bytes()
+        }
+
+surface_pool = SurfacePool()
+
+# ==================== RNG SERVICE ====================
+class RNGService:
+    # sim: oyun durumunu etkileyen her çekiliş; fx: sadece görüntü (çizim bunu tüketir)
+    # Akışlar tek bir tohumdan türetilir, yeniden tohumlama nesneleri yerinde günceller
+    def __init__(self, seed=None):
+        self.sim = random.Random()
+        self.fx = random.Random()
+        self.np_sim = np.random.default_rng()
+        self.np_fx = np.random.default_rng()
+        self.entropy = None
+        self.seed(seed)
+    
+    def seed(self, seed=None):
+        sequence = np.random.SeedSequence(seed)
+        self.entropy = sequence.entropy
+        sim, fx, np_sim, np_fx = sequence.spawn(4)
+        self.sim.seed(int.from_bytes(sim.generate_state(4).tobytes(), 'little'))
+        self.fx.seed(int.from_bytes(fx.generate_state(4).tobytes(), 'little'))
+        self.np_sim.bit_generator.state = np.random.PCG64(np_sim).state
+        self.np_fx.bit_generator.state = np.random.PCG64(np_fx).state
+        return self.entropy
+    
+    def getstate(self):
+        return {
+            'entropy': self.entropy,
+            'sim': self.sim.getstate(),
+            'fx': self.fx.getstate(),
+            'np_sim': self.np_sim.bit_generator.state,
+            'np_fx': self.np_fx.bit_generator.state,
+        }
+    
+    def setstate(self, state):
+        self.entropy = state['entropy']
+        self.sim.setstate(state['sim'])
+        self.fx.setstate(state['fx'])
+        self.np_sim.bit_generator.state = state['np_sim']
+        self.np_fx.bit_generator.state = state['np_fx']
+
+rng_service = RNGService()
+
 # ==================== ENUM'lar ====================
 class GameState(Enum):
     MAIN_MENU = "main_menu"
@@ -131,77 +384,167 @@ class Achievement:
     unlock_time: Optional[int] = None
 
 # ==================== PARTICLE SYSTEM ====================
-class Particle:
-    def __init__(self, x, y, color, size, velocity, lifetime, particle_type="circle"):
-        self.x = x
-        self.y = y
+class ParticleSystem:
+    PARTICLE_CIRCLE = 0
+    PARTICLE_MATRIX = 1
+    ALPHA_LEVELS = 16
+
+    def __init__(self, capacity=1024):
+        self.rng = rng_service.np_fx
+        self.count = 0
+        self.ticks = 0
+        self.circle_sprites = {}
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        # Parçacık verileri dizi yapısında (structure of arrays) tutulur
+        old_count = self.count
+        fields = {
+            'x': np.float64, 'y': np.float64,
+            'vx': np.float64, 'vy': np.float64,
+            'size': np.float64, 'rotation': np.float64, 'rotation_speed': np.float64,
+            'life': np.int32, 'max_life': np.int32,
+            'kind': np.int8, 'char': np.int32
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old_count:
+                array[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, array)
+
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        if old_count:
+            color[:old_count] = self.color[:old_count]
         self.color = color
-        self.size = size
-        self.vx, self.vy = velocity
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.type = particle_type
-        self.char = random.choice(MATRIX_CHARS) if particle_type == "matrix" else None
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-5, 5)
+        self.capacity = capacity
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.lifetime -= 1
-        self.size = max(0, self.size * 0.98)
-        self.rotation += self.rotation_speed
-        return self.lifetime > 0
+    def __len__(self):
+        return self.count
 
-    def draw(self, surface):
-        alpha = int(255 * (self.lifetime / self.max_lifetime))
-        if self.type == "matrix":
-            char_surface = small_font.render(self.char, True, (*self.color[:3], alpha))
-            rotated = pygame.transform.rotate(char_surface, self.rotation)
-            surface.blit(rotated, (self.x - rotated.get_width() // 2, 
-                                 self.y - rotated.get_height() // 2))
-        else:
-            s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color[:3], alpha), 
-                             (self.size, self.size), self.size)
-            surface.blit(s, (self.x - self.size, self.y - self.size))
+    def spawn(self, x, y, vx, vy, size, life, color, kind=PARTICLE_CIRCLE):
+        # Tüm parametreler skaler veya aynı uzunlukta dizi olabilir
+        n = max(np.size(x), np.size(y), np.size(vx), np.size(vy), np.size(size), np.size(life))
+        if self.count + n > self.capacity:
+            capacity = self.capacity
+            while self.count + n > capacity:
+                capacity *= 2
+            self.allocate(capacity)
+
+        start, end = self.count, self.count + n
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = vx
+        self.vy[start:end] = vy
+        self.size[start:end] = size
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.color[start:end] = color[:3]
+        self.kind[start:end] = kind
+        self.rotation[start:end] = self.rng.uniform(0, 360, n)
+        self.rotation_speed[start:end] = self.rng.uniform(-5, 5, n)
+        if kind == self.PARTICLE_MATRIX:
+            self.char[start:end] = self.rng.integers(0, len(MATRIX_CHARS), n)
+        self.count = end
+
+    def add_particle(self, x, y, color, size, velocity, lifetime, particle_type="circle"):
+        kind = self.PARTICLE_MATRIX if particle_type == "matrix" else self.PARTICLE_CIRCLE
+        self.spawn(x, y, velocity[0], velocity[1], size, lifetime, color, kind)
 
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-    
-    def add_particle(self, particle):
-        self.particles.append(particle)
-    
     def add_explosion(self, x, y, color, count=20):
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 5)
-            self.add_particle(Particle(
-                x, y, color,
-                random.uniform(2, 6),
-                (math.cos(angle) * speed, math.sin(angle) * speed),
-                random.randint(20, 60)
-            ))
-    
+        rng = self.rng
+        angle = rng.uniform(0, math.pi * 2, count)
+        speed = rng.uniform(1, 5, count)
+        self.spawn(x, y,
+                   np.cos(angle) * speed, np.sin(angle) * speed,
+                   rng.uniform(2, 6, count),
+                   rng.integers(20, 61, count),
+                   color)
+
     def add_matrix_rain(self, x, y):
-        for _ in range(10):
-            self.add_particle(Particle(
-                x + random.randint(-20, 20),
-                y + random.randint(-20, 20),
-                COLORS['matrix_green'],
-                random.uniform(1, 3),
-                (0, random.uniform(2, 4)),
-                random.randint(30, 90),
-                "matrix"
-            ))
-    
+        rng = self.rng
+        self.spawn(x + rng.integers(-20, 21, 10),
+                   y + rng.integers(-20, 21, 10),
+                   0, rng.uniform(2, 4, 10),
+                   rng.uniform(1, 3, 10),
+                   rng.integers(30, 91, 10),
+                   COLORS['matrix_green'],
+                   self.PARTICLE_MATRIX)
+
+    def clear(self):
+        self.count = 0
+
     def update(self):
-        self.particles = [p for p in self.particles if p.update()]
-    
+        self.ticks += 1
+        n = self.count
+        if n == 0:
+            return
+
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+        self.size[:n] *= 0.98
+        self.rotation[:n] += self.rotation_speed[:n]
+
+        alive = self.life[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return
+
+        # Ölü parçacıkların yerine sondaki canlılar taşınır
+        holes = np.flatnonzero(~alive[:alive_count])
+        movers = np.flatnonzero(alive[alive_count:]) + alive_count
+        for name in ('x', 'y', 'vx', 'vy', 'size', 'rotation', 'rotation_speed',
+                     'life', 'max_life', 'kind', 'char', 'color'):
+            array = getattr(self, name)
+            array[holes] = array[movers]
+        self.count = alive_count
+
+    def circle_sprite(self, key):
+        sprite = self.circle_sprites.get(key)
+        if sprite is None:
+            r, g, b, radius, level = key
+            alpha = level * 255 // (self.ALPHA_LEVELS - 1)
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (r, g, b, alpha), (radius, radius), radius)
+            self.circle_sprites[key] = sprite
+        return sprite
+
     def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
+        n = self.count
+        if n == 0:
+            return
+
+        alpha = (255 * self.life[:n] // self.max_life[:n]).astype(np.int32)
+        radius = self.size[:n].astype(np.int32)
+        kind = self.kind[:n]
+
+        # Daireler renk, yarıçap ve alfa seviyesine göre önbellekten gelir
+        circles = np.flatnonzero((kind == self.PARTICLE_CIRCLE) & (radius > 0))
+        if circles.size:
+            levels = alpha[circles] * (self.ALPHA_LEVELS - 1) // 255
+            colors = self.color[circles].tolist()
+            radii = radius[circles].tolist()
+            xs = (self.x[circles] - radius[circles]).tolist()
+            ys = (self.y[circles] - radius[circles]).tolist()
+            sprite = self.circle_sprite
+            surface.blits([
+                (sprite((color[0], color[1], color[2], r, level)), (px, py))
+                for color, r, level, px, py in zip(colors, radii, levels.tolist(), xs, ys)
+            ], False)
+
+        for i in np.flatnonzero(kind == self.PARTICLE_MATRIX).tolist():
+            rotated = rotated_glyphs.get(MATRIX_CHARS[self.char[i]], self.color[i].tolist(), self.rotation[i])
+            rotated.set_alpha(int(alpha[i]))
+            surface.blit(rotated, (self.x[i] - rotated.get_width() // 2,
+                                   self.y[i] - rotated.get_height() // 2))
+
+    def dirty_rects(self):
+        n = self.count
+        half = np.where(self.kind[:n] == self.PARTICLE_MATRIX, 12, self.size[:n] + 1)
+        return [
+            pygame.Rect(x - h, y - h, h * 2, h * 2)
+            for x, y, h in zip(self.x[:n].tolist(), self.y[:n].tolist(), half.tolist())
+        ]
 
 # ==================== UPGRADE SYSTEM ====================
 class UpgradeSystem:
@@ -320,7 +663,7 @@ class MissionSystem:
         self.select_starting_missions()
     
     def select_starting_missions(self):
-        self.active_missions = random.sample(self.missions[:4], 2)
+        self.active_missions = rng_service.sim.sample(self.missions[:4], 2)
     
     def update_progress(self, game_data):
         for mission in self.active_missions:
@@ -345,7 +688,7 @@ class MissionSystem:
         # Yeni görev ekle
         available = [m for m in self.missions if m not in self.completed_missions and m not in self.active_missions]
         if available and len(self.active_missions) < 3:
-            self.active_missions.append(random.choice(available))
+            self.active_missions.append(rng_service.sim.choice(available))
         return mission.reward
     
     def draw(self, surface):
@@ -379,10 +722,504 @@ class MissionSystem:
             
             y_offset += 90
 
+    def dirty_rects(self):
+        return [pygame.Rect(WIDTH - 320, 100, 300, 400)]
+
+# ==================== ECS CORE ====================
+class SimField:
+    # Varlığa bağlı nesnede değer arketip sütununda, bağlı değilse nesnede durur
+    def __init__(self, name):
+        self.name = name
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        sim = obj.sim
+        if sim is None:
+            return obj.__dict__[self.name]
+        return sim.columns[self.name].item(obj.slot)
+    
+    def __set__(self, obj, value):
+        sim = obj.sim
+        if sim is None:
+            obj.__dict__[self.name] = value
+        else:
+            sim.columns[self.name][obj.slot] = value
+
+class Archetype:
+    def __init__(self, components, fields, objects, handles, capacity=64):
+        self.components = components
+        self.fields = fields
+        self.objects = objects
+        self.handles = handles
+        self.ids = []
+        self.count = 0
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in fields.items()}
+        self.lists = {name: [] for name in objects}
+    
+    def __len__(self):
+        return self.count
+    
+    def view(self):
+        n = self.count
+        return {name: column[:n] for name, column in self.columns.items()}
+    
+    def append(self, entity, values):
+        if self.count == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                grown = np.zeros(self.capacity, dtype=column.dtype)
+                grown[:self.count] = column[:self.count]
+                self.columns[name] = grown
+        
+        row = self.count
+        for name, column in self.columns.items():
+            column[row] = values[name]
+        for name, items in self.lists.items():
+            items.append(values[name])
+        self.ids.append(entity)
+        self.count += 1
+        return row
+    
+    def delete(self, row):
+        # Son satır boşalan yere taşınır (swap-remove); taşınan varlık döner.
+        # Satır sırası korunmaz: satırları tikler arasında eşleyen kod kimliğe bakmalı
+        last = self.count - 1
+        moved = None
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            for items in self.lists.values():
+                items[row] = items[last]
+            moved = self.ids[row] = self.ids[last]
+        for items in self.lists.values():
+            items.pop()
+        self.ids.pop()
+        self.count = last
+        return moved
+
+class World:
+    INDEX_BITS = 32
+    INDEX_MASK = (1 << INDEX_BITS) - 1
+    
+    def __init__(self):
+        self.schema = {}
+        self.handles = set()
+        self.archetypes = {}
+        self.generations = np.ones(256, dtype=np.int64)
+        self.next_index = 0
+        self.free_indices = []
+        self.homes = []
+        self.rows = []
+        self.systems = []
+        self.profiler = None
+    
+    def register(self, component, fields=None, handle=False):
+        # fields=None: nesne bileşeni, {}: etiket, aksi halde sayısal sütunlar
+        self.schema[component] = fields
+        if handle:
+            self.handles.add(component)
+    
+    def fields_of(self, components):
+        fields = {}
+        for component in sorted(components):
+            fields.update(self.schema[component] or {})
+        return fields
+    
+    def archetype(self, components):
+        key = frozenset(components)
+        arch = self.archetypes.get(key)
+        if arch is None:
+            objects = tuple(sorted(c for c in key if self.schema[c] is None))
+            handles = tuple(c for c in objects if c in self.handles)
+            arch = self.archetypes[key] = Archetype(key, self.fields_of(key), objects, handles)
+        return arch
+    
+    def objects(self, components, name):
+        arch = self.archetypes.get(frozenset(components))
+        return arch.lists[name] if arch else []
+    
+    def query(self, *components, exclude=()):
+        required = set(components)
+        return [arch for key, arch in self.archetypes.items()
+                if arch.count and required <= key and not key.intersection(exclude)]
+    
+    def spawn(self, components, **values):
+        arch = self.archetype(components)
+        
+        if self.free_indices:
+            index = self.free_indices.pop()
+        else:
+            index = self.next_index
+            self.next_index += 1
+            if index == len(self.generations):
+                self.generations = np.concatenate([self.generations, np.ones_like(self.generations)])
+            self.homes.append(None)
+            self.rows.append(0)
+        
+        entity = (int(self.generations[index]) << self.INDEX_BITS) | index
+        row = arch.append(entity, values)
+        self.homes[index] = arch
+        self.rows[index] = row
+        
+        for name in arch.objects:
+            obj = values[name]
+            obj.entity = entity
+            if name in arch.handles:
+                obj.sim = arch
+                obj.slot = row
+        return entity
+    
+    def alive(self, entity):
+        index = entity & self.INDEX_MASK
+        return (index < self.next_index and
+                int(self.generations[index]) == entity >> self.INDEX_BITS)
+    
+    def alive_mask(self, entities):
+        index = entities & self.INDEX_MASK
+        known = index < self.next_index
+        return known & (self.generations[np.where(known, index, 0)] == entities >> self.INDEX_BITS)
+    
+    def despawn(self, entity):
+        if not self.alive(entity):
+            return False
+        
+        index = entity & self.INDEX_MASK
+        arch = self.homes[index]
+        row = self.rows[index]
+        
+        # Bağlı nesneler son değerlerini geri alır
+        for name in arch.handles:
+            obj = arch.lists[name][row]
+            for field in arch.fields:
+                if isinstance(getattr(type(obj), field, None), SimField):
+                    obj.__dict__[field] = arch.columns[field].item(row)
+            obj.sim = None
+            obj.slot = -1
+        
+        moved = arch.delete(row)
+        if moved is not None:
+            self.rows[moved & self.INDEX_MASK] = row
+            for name in arch.handles:
+                arch.lists[name][row].slot = row
+        
+        self.generations[index] += 1
+        self.homes[index] = None
+        self.free_indices.append(index)
+        return True
+    
+    def clear(self):
+        for arch in self.archetypes.values():
+            for entity in reversed(arch.ids[:]):
+                self.despawn(entity)
+    
+    def add_system(self, name, system):
+        self.systems.append((name, system))
+    
+    def __getstate__(self):
+        # Sistemler GameManager'a bağlı; anahtar karelere yalnızca depolama girer
+        state = self.__dict__.copy()
+        state['systems'] = []
+        state['profiler'] = None
+        return state
+    
+    def run_systems(self, *args):
+        # Her sistem tik başına bir kez, eklenme sırasıyla çalışır
+        profiler = self.profiler
+        for name, system in self.systems:
+            with profiler.section(name) if profiler else NULL_SECTION:
+                system(*args)
+
+# ==================== BULLET POOL ====================
+class BulletPool:
+    # Taraflar
+    PLAYER = 0
+    ENEMY = 1
+    BOSS = 2
+
+    # Bayraklar
+    LASER = 1
+    SHIELD = 2
+    TIME_SLOW = 4
+
+    FIELDS = {
+        'x': np.float64, 'y': np.float64,
+        'dx': np.float64, 'dy': np.float64,
+        'size': np.float64, 'damage': np.float64,
+        'pierce': np.int32, 'pierced': np.int32,
+        'owner': np.int64, 'faction': np.int8, 'flags': np.int8
+    }
+
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self.ticks = 0
+        self.last_time_scale = 1.0
+        self.sprites = {}
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old_count = self.count
+        for name, dtype in self.FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old_count:
+                array[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, array)
+
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        if old_count:
+            color[:old_count] = self.color[:old_count]
+        self.color = color
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def getstate(self):
+        # Anahtar kareler için yalnızca canlı satırların kopyası
+        n = self.count
+        state = {name: getattr(self, name)[:n].copy() for name in list(self.FIELDS) + ['color']}
+        state.update(count=n, ticks=self.ticks, last_time_scale=self.last_time_scale)
+        return state
+
+    def setstate(self, state):
+        n = state['count']
+        self.count = 0
+        capacity = self.capacity
+        while n > capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            self.allocate(capacity)
+        for name in list(self.FIELDS) + ['color']:
+            getattr(self, name)[:n] = state[name]
+        self.count = n
+        self.ticks = state['ticks']
+        self.last_time_scale = state['last_time_scale']
+
+    def spawn(self, faction, x, y, dx, dy, size, color, owner=0, damage=0, pierce=0, flags=0):
+        # Tek mermi veya aynı uzunlukta dizilerle toplu ekleme
+        n = max(np.size(x), np.size(y), np.size(dx), np.size(dy), np.size(size))
+        if self.count + n > self.capacity:
+            capacity = self.capacity
+            while self.count + n > capacity:
+                capacity *= 2
+            self.allocate(capacity)
+
+        start, end = self.count, self.count + n
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = dx
+        self.dy[start:end] = dy
+        self.size[start:end] = size
+        self.color[start:end] = color
+        self.owner[start:end] = owner
+        self.damage[start:end] = damage
+        self.pierce[start:end] = pierce
+        self.pierced[start:end] = 0
+        self.faction[start:end] = faction
+        self.flags[start:end] = flags
+        self.count = end
+
+    def indices(self, faction):
+        return np.flatnonzero(self.faction[:self.count] == faction)
+
+    def count_faction(self, faction):
+        return int(np.count_nonzero(self.faction[:self.count] == faction))
+
+    def update(self, time_scale=1.0):
+        self.ticks += 1
+        self.last_time_scale = time_scale
+        n = self.count
+        if n == 0:
+            return
+
+        # Oyuncu mermileri zaman ölçeğiyle, diğerleri sabit hızla ilerler
+        player = self.faction[:n] == self.PLAYER
+        step = np.where(player, time_scale, 1.0)
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.dx[:n] * step
+        y += self.dy[:n] * step
+
+        out = np.where(player, y < -10,
+                       (x < -50) | (x > WIDTH + 50) | (y < -50) | (y > HEIGHT + 50))
+        if out.any():
+            self.remove(np.flatnonzero(out))
+
+    def cull_orphans(self, world):
+        # Sahibi dünyadan çıkan düşman ve boss mermileri de kaldırılır
+        n = self.count
+        if n == 0:
+            return
+        owned = self.faction[:n] != self.PLAYER
+        orphan = owned & ~world.alive_mask(self.owner[:n])
+        if orphan.any():
+            self.remove(np.flatnonzero(orphan))
+
+    def remove(self, indices):
+        n = self.count
+        keep = np.ones(n, dtype=bool)
+        keep[indices] = False
+        alive_count = int(np.count_nonzero(keep))
+        if alive_count == n:
+            return
+
+        # Silinen mermilerin yerine sondaki mermiler taşınır
+        holes = np.flatnonzero(~keep[:alive_count])
+        movers = np.flatnonzero(keep[alive_count:]) + alive_count
+        for name in ('x', 'y', 'dx', 'dy', 'size', 'damage', 'pierce', 'pierced',
+                     'owner', 'faction', 'flags', 'color'):
+            array = getattr(self, name)
+            array[holes] = array[movers]
+        self.count = alive_count
+
+    def clear(self):
+        self.count = 0
+
+    def sprite(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            r, g, b, size = key
+            if size < 0:
+                # Oyuncu mermisi: dikey dikdörtgen
+                sprite = pygame.Surface((-size, -size * 3))
+                sprite.fill((r, g, b))
+            else:
+                sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (r, g, b), (size, size), size)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, player_bullet_size=4):
+        n = self.count
+        if n == 0:
+            return
+
+        faction = self.faction[:n]
+        flags = self.flags[:n]
+        colors = self.color[:n].copy()
+        colors[(flags & self.SHIELD) != 0] = COLORS['matrix_cyan']
+        colors[(flags & (self.SHIELD | self.TIME_SLOW)) == self.TIME_SLOW] = COLORS['matrix_purple']
+
+        player = faction == self.PLAYER
+        radius = self.size[:n].astype(np.int32)
+        size = np.where(player, -player_bullet_size, radius)
+        half = player_bullet_size // 2
+        xs = np.where(player, self.x[:n] - half, self.x[:n].astype(np.int32) - radius)
+        ys = np.where(player, self.y[:n] - player_bullet_size * 2, self.y[:n].astype(np.int32) - radius)
+
+        sprite = self.sprite
+        surface.blits([
+            (sprite((color[0], color[1], color[2], s)), (px, py))
+            for color, s, px, py in zip(colors.tolist(), size.tolist(), xs.tolist(), ys.tolist())
+            if s != 0
+        ], False)
+
+    def dirty_rects(self, player_bullet_size=4):
+        n = self.count
+        player = self.faction[:n] == self.PLAYER
+        half = np.where(player, player_bullet_size * 3, self.size[:n] + 1)
+        return [
+            pygame.Rect(x - h, y - h, h * 2, h * 2)
+            for x, y, h in zip(self.x[:n].tolist(), self.y[:n].tolist(), half.tolist())
+        ]
+
+bullet_pool = BulletPool()
+
+# ==================== SPATIAL HASH ====================
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+        self.next_order = 0
+    
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+        self.next_order = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __contains__(self, item):
+        return item in self.entries
+    
+    def cell_range(self, x, y, w, h):
+        cs = self.cell_size
+        return (int(x // cs), int(y // cs), int((x + w) // cs), int((y + h) // cs))
+    
+    def insert(self, item, x, y, w=0, h=0):
+        # Sıra numarası sorgu sonuçlarını ekleme sırasında tutar
+        order = self.next_order
+        self.next_order += 1
+        cells = self.cell_range(x, y, w, h)
+        self.entries[item] = (order, x, y, cells)
+        
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append((order, item))
+    
+    def remove(self, item):
+        entry = self.entries.pop(item, None)
+        if entry is None:
+            return
+        order, _, _, (x0, y0, x1, y1) = entry
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    bucket.remove((order, item))
+    
+    def query_rect(self, x, y, w=0, h=0):
+        x0, y0, x1, y1 = self.cell_range(x, y, w, h)
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for order, item in self.cells.get((cx, cy), ()):
+                    found[order] = item
+        return [found[order] for order in sorted(found)]
+    
+    def query_point(self, x, y):
+        return self.query_rect(x, y)
+    
+    def query_points(self, xs, ys):
+        # Noktaların düştüğü hücrelerdeki tüm kayıtlar, tekrarsız
+        if len(xs) == 0:
+            return []
+        cs = self.cell_size
+        keys = np.unique(np.stack([np.floor_divide(xs, cs), np.floor_divide(ys, cs)], axis=1)
+                         .astype(np.int64), axis=0)
+        found = {}
+        for key in keys.tolist():
+            for order, item in self.cells.get(tuple(key), ()):
+                found[order] = item
+        return [found[order] for order in sorted(found)]
+    
+    def query_radius(self, x, y, radius):
+        # Çapa noktası yarıçap içinde kalanlar, mesafeleriyle birlikte
+        results = []
+        for item in self.query_rect(x - radius, y - radius, radius * 2, radius * 2):
+            _, ix, iy, _ = self.entries[item]
+            distance = math.sqrt((ix - x)**2 + (iy - y)**2)
+            if distance < radius:
+                results.append((item, distance))
+        return results
+
+def point_aabb_hits(px, py, left, top, size):
+    # Nokta-kutu testi tek seferde: (mermi, kutu) çiftleri satır sırasıyla döner
+    inside = ((px[:, None] > left[None, :]) &
+              (px[:, None] < left[None, :] + size[None, :]) &
+              (py[:, None] > top[None, :]) &
+              (py[:, None] < top[None, :] + size[None, :]))
+    return np.nonzero(inside)
+
 # ==================== BOSS SYSTEM ====================
 class MatrixBoss:
-    def __init__(self, wave):
+    def __init__(self, wave, world):
         self.wave = wave
+        self.world = world
         self.size = 150 + wave * 20
         self.x = WIDTH // 2
         self.y = -200
@@ -392,12 +1229,11 @@ class MatrixBoss:
         self.pattern = 0
         self.attack_timer = 0
         self.phase = 1
-        self.bullets = []
-        self.minions = []
+        self.entity = 0
         self.invulnerable = False
         self.invulnerable_timer = 0
-        self.color = random.choice([COLORS['matrix_red'], COLORS['matrix_purple'], COLORS['matrix_orange']])
-        self.name = random.choice(["Agent Smith", "The Architect", "Merovingian", "The Oracle"])
+        self.color = rng_service.fx.choice([COLORS['matrix_red'], COLORS['matrix_purple'], COLORS['matrix_orange']])
+        self.name = rng_service.fx.choice(["Agent Smith", "The Architect", "Merovingian", "The Oracle"])
         
         # Boss yetenekleri
         self.abilities = {
@@ -438,51 +1274,36 @@ class MatrixBoss:
             self.attack_timer -= 1
             if self.attack_timer <= 0:
                 self.random_attack()
-                self.attack_timer = random.randint(30, 90)
-            
-            # Minionları güncelle
-            for minion in self.minions[:]:
-                minion.update()
-                if minion.health <= 0:
-                    self.minions.remove(minion)
+                self.attack_timer = rng_service.sim.randint(30, 90)
         
         # Invulnerability
         if self.invulnerable:
             self.invulnerable_timer -= 1
             if self.invulnerable_timer <= 0:
                 self.invulnerable = False
-        
-        # Mermileri güncelle
-        for bullet in self.bullets[:]:
-            bullet['x'] += bullet['dx']
-            bullet['y'] += bullet['dy']
-            if (bullet['x'] < -50 or bullet['x'] > WIDTH + 50 or 
-                bullet['y'] < -50 or bullet['y'] > HEIGHT + 50):
-                self.bullets.remove(bullet)
+    
+    @property
+    def minions(self):
+        return self.world.objects(MINION, 'enemy')
     
     def random_attack(self):
         if self.phase == 1:
             self.circular_attack()
         elif self.phase == 2:
-            if random.random() < 0.5:
+            if rng_service.sim.random() < 0.5:
                 self.laser_beam()
             else:
                 self.spawn_minions()
         else:
             attacks = [self.circular_attack, self.laser_beam, self.spawn_minions]
-            random.choice(attacks)()
+            rng_service.sim.choice(attacks)()
     
     def circular_attack(self):
-        for angle in range(0, 360, 20):
-            rad = math.radians(angle + random.randint(-5, 5))
-            self.bullets.append({
-                'x': self.x + self.size//2,
-                'y': self.y + self.size//2,
-                'dx': math.cos(rad) * 4,
-                'dy': math.sin(rad) * 4,
-                'color': self.color,
-                'size': 8
-            })
+        rad = np.radians([angle + rng_service.sim.randint(-5, 5) for angle in range(0, 360, 20)])
+        bullet_pool.spawn(BulletPool.BOSS,
+                          self.x + self.size//2, self.y + self.size//2,
+                          np.cos(rad) * 4, np.sin(rad) * 4,
+                          8, self.color, owner=self.entity, damage=10)
     
     def laser_beam(self):
         if self.abilities["laser_beam"]["cooldown"] > 0:
@@ -491,16 +1312,11 @@ class MatrixBoss:
         self.abilities["laser_beam"]["cooldown"] = self.abilities["laser_beam"]["max_cooldown"]
         
         # Laser çizgisi
-        for i in range(50):
-            self.bullets.append({
-                'x': self.x + self.size//2,
-                'y': self.y + self.size + i * 10,
-                'dx': 0,
-                'dy': 0,
-                'color': COLORS['matrix_red'],
-                'size': 20 - i * 0.3,
-                'laser': True
-            })
+        i = np.arange(50)
+        bullet_pool.spawn(BulletPool.BOSS,
+                          self.x + self.size//2, self.y + self.size + i * 10,
+                          0, 0, 20 - i * 0.3, COLORS['matrix_red'],
+                          owner=self.entity, damage=20, flags=BulletPool.LASER)
     
     def spawn_minions(self):
         if self.abilities["spawn_minions"]["cooldown"] > 0:
@@ -510,45 +1326,36 @@ class MatrixBoss:
         
         for _ in range(3):
             minion = Enemy(EnemyType.VIRUS, 1)
-            minion.x = self.x + random.randint(-100, 100)
+            minion.x = self.x + rng_service.sim.randint(-100, 100)
             minion.y = self.y + self.size
-            self.minions.append(minion)
+            spawn_enemy(self.world, minion, minion=True)
     
     def activate_shield_wall(self):
         self.invulnerable = True
         self.invulnerable_timer = 180
         
         # Kalkan oluştur
-        for angle in range(0, 360, 45):
-            rad = math.radians(angle)
-            for i in range(5):
-                self.bullets.append({
-                    'x': self.x + self.size//2 + math.cos(rad) * (self.size//2 + i * 20),
-                    'y': self.y + self.size//2 + math.sin(rad) * (self.size//2 + i * 20),
-                    'dx': 0,
-                    'dy': 0,
-                    'color': COLORS['matrix_cyan'],
-                    'size': 10,
-                    'shield': True
-                })
+        rad = np.repeat(np.radians(np.arange(0, 360, 45)), 5)
+        radius = self.size//2 + np.tile(np.arange(5), 8) * 20
+        bullet_pool.spawn(BulletPool.BOSS,
+                          self.x + self.size//2 + np.cos(rad) * radius,
+                          self.y + self.size//2 + np.sin(rad) * radius,
+                          0, 0, 10, COLORS['matrix_cyan'],
+                          owner=self.entity, damage=10, flags=BulletPool.SHIELD)
     
     def activate_time_slow(self):
         self.invulnerable = True
         self.invulnerable_timer = 120
         
         # Zaman yavaşlatma efekti
-        for _ in range(20):
-            angle = random.uniform(0, math.pi * 2)
-            radius = random.uniform(self.size//2, self.size * 2)
-            self.bullets.append({
-                'x': self.x + self.size//2 + math.cos(angle) * radius,
-                'y': self.y + self.size//2 + math.sin(angle) * radius,
-                'dx': math.cos(angle) * 0.5,
-                'dy': math.sin(angle) * 0.5,
-                'color': COLORS['matrix_purple'],
-                'size': 15,
-                'time_slow': True
-            })
+        angle = np.array([rng_service.sim.uniform(0, math.pi * 2) for _ in range(20)])
+        radius = np.array([rng_service.sim.uniform(self.size//2, self.size * 2) for _ in range(20)])
+        bullet_pool.spawn(BulletPool.BOSS,
+                          self.x + self.size//2 + np.cos(angle) * radius,
+                          self.y + self.size//2 + np.sin(angle) * radius,
+                          np.cos(angle) * 0.5, np.sin(angle) * 0.5,
+                          15, COLORS['matrix_purple'],
+                          owner=self.entity, damage=10, flags=BulletPool.TIME_SLOW)
     
     def draw(self, surface):
         # Boss gövdesi
@@ -592,30 +1399,216 @@ class MatrixBoss:
         health_text = font.render(f"{int(self.health)}/{self.max_health}", True, COLORS['matrix_white'])
         surface.blit(health_text, (health_x + health_width//2 - health_text.get_width()//2, health_y + 3))
         
-        # Mermileri çiz
-        for bullet in self.bullets:
-            if bullet.get('laser'):
-                pygame.draw.circle(surface, (*bullet['color'], 150),
-                                 (int(bullet['x']), int(bullet['y'])), bullet['size'])
-            elif bullet.get('shield'):
-                pygame.draw.circle(surface, (*COLORS['matrix_cyan'], 100),
-                                 (int(bullet['x']), int(bullet['y'])), bullet['size'])
-            elif bullet.get('time_slow'):
-                pygame.draw.circle(surface, (*COLORS['matrix_purple'], 100),
-                                 (int(bullet['x']), int(bullet['y'])), bullet['size'])
-            else:
-                pygame.draw.circle(surface, bullet['color'],
-                                 (int(bullet['x']), int(bullet['y'])), bullet['size'])
-        
         # Minionları çiz
         for minion in self.minions:
             minion.draw(surface)
 
+    def dirty_rects(self):
+        rects = [
+            pygame.Rect(self.x - 2, self.y - 2, self.size + 4, self.size + 4),
+            pygame.Rect(WIDTH//2 - 150, 0, 300, 50)
+        ]
+        for minion in self.minions:
+            rects.extend(minion.dirty_rects())
+        return rects
+
+# ==================== ENEMY AI ====================
+# Düşman arketipleri: dalga düşmanları ve boss minionları
+ENEMY = ('kinematics', 'ai', 'enemy')
+MINION = ENEMY + ('minion',)
+ENEMY_KINDS = {enemy_type: i for i, enemy_type in enumerate(EnemyType)}
+
+def register_enemy_components(world):
+    world.register('kinematics', {
+        'x': np.float64, 'y': np.float64,
+        'size': np.int64, 'speed': np.float64
+    })
+    world.register('ai', {
+        'target_x': np.float64, 'target_y': np.float64,
+        'attacking': np.bool_, 'aggro_range': np.float64,
+        'shoot_timer': np.int64, 'shoot_chance': np.float64,
+        'ability_cooldown': np.int64, 'teleport_cooldown': np.int64,
+        'spawn_cooldown': np.int64, 'stealth_timer': np.int64,
+        'kind': np.int8
+    })
+    world.register('enemy', handle=True)
+    world.register('minion', {})
+
+def spawn_enemy(world, enemy, minion=False):
+    components = MINION if minion else ENEMY
+    values = {name: getattr(enemy, name) for name in world.fields_of(components) if name != 'kind'}
+    return world.spawn(components, kind=ENEMY_KINDS[enemy.type], enemy=enemy, **values)
+
+def update_enemy_ai(arch, player_x, player_y):
+    entities = arch.lists['enemy']
+    if not entities:
+        return
+    
+    c = arch.view()
+    x, y = c['x'], c['y']
+    target_x, target_y = c['target_x'], c['target_y']
+    size, speed = c['size'], c['speed']
+    kind = c['kind']
+    kinds = ENEMY_KINDS
+    
+    # Takip ve devriye kararları tüm arketip için
+    distance = np.sqrt((x - player_x)**2 + (y - player_y)**2)
+    attack = distance < c['aggro_range']
+    c['attacking'][:] = attack
+    retarget = ~attack & (np.abs(x - target_x) < 10) & (np.abs(y - target_y) < 10)
+    
+    # Yetenek sayaçları
+    ability_cooldown = c['ability_cooldown']
+    ability_cooldown[(kind == kinds[EnemyType.HACKER]) & (ability_cooldown > 0)] -= 1
+    
+    teleport_cooldown = c['teleport_cooldown']
+    glitch = (kind == kinds[EnemyType.GLITCH]) & (teleport_cooldown > 0)
+    teleport_cooldown[glitch] -= 1
+    teleport = glitch & (teleport_cooldown == 0)
+    
+    spawn_cooldown = c['spawn_cooldown']
+    worm = (kind == kinds[EnemyType.WORM]) & (spawn_cooldown > 0)
+    spawn_cooldown[worm] -= 1
+    spawn = worm & (spawn_cooldown == 0)
+    
+    stealth_timer = c['stealth_timer']
+    trojan = kind == kinds[EnemyType.TROJAN]
+    stealth_timer[trojan] -= 1
+    stealth = trojan & (stealth_timer <= 0)
+    
+    shoot_timer = c['shoot_timer']
+    shoot_timer -= 1
+    shoot = shoot_timer <= 0
+    
+    # Rastgele sayı çeken düşmanlar liste sırasıyla tek tek işlenir
+    teleports = []
+    shooters = []
+    for i in np.flatnonzero(retarget | teleport | spawn | stealth | shoot).tolist():
+        enemy = entities[i]
+        if retarget[i]:
+            target_x[i] = rng_service.sim.randint(0, WIDTH - size.item(i))
+            target_y[i] = rng_service.sim.randint(0, HEIGHT//3)
+        
+        if teleport[i]:
+            teleports.append((i, rng_service.sim.randint(0, WIDTH - size.item(i)),
+                              rng_service.sim.randint(0, HEIGHT//2)))
+            teleport_cooldown[i] = 180
+        elif spawn[i]:
+            if enemy.health < enemy.max_health * 0.5:
+                enemy.spawn_minions()
+                spawn_cooldown[i] = 300
+        elif stealth[i]:
+            stealth_timer[i] = rng_service.sim.randint(120, 300)
+        
+        if shoot[i] and rng_service.sim.random() < c['shoot_chance'][i]:
+            shooters.append(i)
+            shoot_timer[i] = rng_service.sim.randint(90, 240)
+    
+    # Hareket
+    half = size // 2
+    dx = np.where(attack, player_x - (x + half), target_x - x)
+    dy = np.where(attack, player_y - (y + half), target_y - y)
+    dist = np.maximum(1, np.sqrt(dx*dx + dy*dy))
+    step = np.where(attack, speed, speed * 0.5)
+    x += (dx/dist) * step
+    y += (dy/dist) * step
+    
+    # Işınlanma hareketten sonra uygulanır
+    for i, new_x, new_y in teleports:
+        x[i] = new_x
+        y[i] = new_y
+    
+    for i in shooters:
+        entities[i].shoot()
+
 # ==================== ENEMY SYSTEM ====================
+class EnemySpriteCache:
+    GLITCH_VARIANTS = 8
+    SHIELD_STEPS = 16
+
+    def __init__(self):
+        self.bodies = {}
+        self.shields = {}
+        self.hacker_symbol = None
+
+    def body(self, enemy, alpha):
+        variant = rng_service.fx.randrange(self.GLITCH_VARIANTS) if enemy.type == EnemyType.GLITCH else 0
+        key = (enemy.type, enemy.level, enemy.size, alpha)
+        variants = self.bodies.get(key)
+        if variants is None:
+            count = self.GLITCH_VARIANTS if enemy.type == EnemyType.GLITCH else 1
+            variants = self.bodies[key] = [self.build_body(enemy, alpha) for _ in range(count)]
+        return variants[variant]
+
+    def build_body(self, enemy, alpha):
+        size = enemy.size
+        s = pygame.Surface((size, size), pygame.SRCALPHA)
+        if enemy.type == EnemyType.GLITCH:
+            # Glitch efekti - her varyant farklı titreşimle çizilir
+            points = []
+            for i in range(8):
+                angle = math.radians(45 * i + rng_service.fx.randint(-5, 5))
+                radius = size//2 + rng_service.fx.randint(-5, 5)
+                points.append((
+                    size//2 + math.cos(angle) * radius,
+                    size//2 + math.sin(angle) * radius
+                ))
+            pygame.draw.polygon(s, (*enemy.color[:3], alpha), points)
+        else:
+            pygame.draw.rect(s, (*enemy.color[:3], alpha), (0, 0, size, size))
+        
+        # Detaylar
+        if enemy.type == EnemyType.HACKER:
+            # Hacker sembolü
+            if self.hacker_symbol is None:
+                self.hacker_symbol = font.render("⟁", True, COLORS['matrix_white'])
+            sym = self.hacker_symbol
+            s.blit(sym, (size//2 - sym.get_width()//2, size//2 - sym.get_height()//2))
+        elif enemy.type == EnemyType.VIRUS:
+            # Virüs sembolü
+            pygame.draw.circle(s, COLORS['matrix_white'], (size//2, size//2), size//4)
+        
+        if pygame.display.get_surface() is not None:
+            s = s.convert_alpha()
+        return s
+
+    def shield(self, size, pulse):
+        step = int(pulse * (self.SHIELD_STEPS - 1) + 0.5)
+        key = (size, step)
+        shield_surf = self.shields.get(key)
+        if shield_surf is None:
+            shield_alpha = 100 + int(155 * step / (self.SHIELD_STEPS - 1))
+            shield_surf = pygame.Surface((size + 10, size + 10), pygame.SRCALPHA)
+            pygame.draw.rect(shield_surf, (*COLORS['matrix_cyan'], shield_alpha),
+                           (0, 0, size + 10, size + 10), 3)
+            self.shields[key] = shield_surf
+        return shield_surf
+
+enemy_sprites = EnemySpriteCache()
+
 class Enemy:
+    # Dünyaya bağlıyken bu alanlar arketip sütunlarında tutulur
+    entity = 0
+    sim = None
+    slot = -1
+    x = SimField('x')
+    y = SimField('y')
+    target_x = SimField('target_x')
+    target_y = SimField('target_y')
+    attacking = SimField('attacking')
+    shoot_timer = SimField('shoot_timer')
+    ability_cooldown = SimField('ability_cooldown')
+    teleport_cooldown = SimField('teleport_cooldown')
+    spawn_cooldown = SimField('spawn_cooldown')
+    stealth_timer = SimField('stealth_timer')
+    
     def __init__(self, enemy_type, level=1):
         self.type = enemy_type
         self.level = level
+        self.ability_cooldown = 0
+        self.teleport_cooldown = 0
+        self.spawn_cooldown = 0
+        self.stealth_timer = 0
         
         if enemy_type == EnemyType.BASIC:
             self.size = 20 + level * 5
@@ -687,110 +1680,37 @@ class Enemy:
             self.stealth_timer = 0
             
         self.max_health = self.health
-        self.x = random.randint(0, WIDTH - self.size)
-        self.y = random.randint(-100, -40)
-        self.target_x = random.randint(0, WIDTH - self.size)
-        self.target_y = random.randint(0, HEIGHT//3)
-        self.bullets = []
-        self.shoot_timer = random.randint(60, 180)
-        self.ai_state = "patrol"
+        self.x = rng_service.sim.randint(0, WIDTH - self.size)
+        self.y = rng_service.sim.randint(-100, -40)
+        self.target_x = rng_service.sim.randint(0, WIDTH - self.size)
+        self.target_y = rng_service.sim.randint(0, HEIGHT//3)
+        self.shoot_timer = rng_service.sim.randint(60, 180)
+        self.attacking = False
         self.aggro_range = 300 + level * 50
     
-    def update(self, player_x=None, player_y=None):
-        # AI davranışı
-        if player_x is not None and player_y is not None:
-            distance_to_player = math.sqrt((self.x - player_x)**2 + (self.y - player_y)**2)
-            
-            if distance_to_player < self.aggro_range:
-                self.ai_state = "attack"
-                # Oyuncuyu takip et
-                dx = player_x - (self.x + self.size//2)
-                dy = player_y - (self.y + self.size//2)
-                dist = max(1, math.sqrt(dx*dx + dy*dy))
-                self.x += (dx/dist) * self.speed
-                self.y += (dy/dist) * self.speed
-            else:
-                self.ai_state = "patrol"
-                # Patrol hareketi
-                if abs(self.x - self.target_x) < 10 and abs(self.y - self.target_y) < 10:
-                    self.target_x = random.randint(0, WIDTH - self.size)
-                    self.target_y = random.randint(0, HEIGHT//3)
-                
-                dx = self.target_x - self.x
-                dy = self.target_y - self.y
-                dist = max(1, math.sqrt(dx*dx + dy*dy))
-                self.x += (dx/dist) * self.speed * 0.5
-                self.y += (dy/dist) * self.speed * 0.5
-        
-        # Yetenekleri güncelle
-        self.update_abilities()
-        
-        # Ateş etme
-        self.shoot_timer -= 1
-        if self.shoot_timer <= 0 and random.random() < self.shoot_chance:
-            self.shoot()
-            self.shoot_timer = random.randint(90, 240)
-        
-        # Mermileri güncelle
-        for bullet in self.bullets[:]:
-            bullet['x'] += bullet['dx']
-            bullet['y'] += bullet['dy']
-            if (bullet['x'] < -50 or bullet['x'] > WIDTH + 50 or 
-                bullet['y'] < -50 or bullet['y'] > HEIGHT + 50):
-                self.bullets.remove(bullet)
-    
-    def update_abilities(self):
-        if self.type == EnemyType.HACKER and self.ability_cooldown > 0:
-            self.ability_cooldown -= 1
-            
-        elif self.type == EnemyType.GLITCH and self.teleport_cooldown > 0:
-            self.teleport_cooldown -= 1
-            if self.teleport_cooldown == 0:
-                # Işınlanma
-                self.x = random.randint(0, WIDTH - self.size)
-                self.y = random.randint(0, HEIGHT//2)
-                self.teleport_cooldown = 180
-                
-        elif self.type == EnemyType.WORM and self.spawn_cooldown > 0:
-            self.spawn_cooldown -= 1
-            if self.spawn_cooldown == 0 and self.health < self.max_health * 0.5:
-                self.spawn_minions()
-                self.spawn_cooldown = 300
-                
-        elif self.type == EnemyType.TROJAN:
-            self.stealth_timer -= 1
-            if self.stealth_timer <= 0:
-                self.stealth_timer = random.randint(120, 300)
+    @property
+    def ai_state(self):
+        return "attack" if self.attacking else "patrol"
     
     def shoot(self):
         if self.type == EnemyType.VIRUS:
             # Virüs - çoklu ateş
-            for angle in range(-30, 31, 15):
-                rad = math.radians(angle)
-                self.bullets.append({
-                    'x': self.x + self.size//2,
-                    'y': self.y + self.size,
-                    'dx': math.sin(rad) * 2,
-                    'dy': math.cos(rad) * 4,
-                    'color': self.color,
-                    'size': 4
-                })
+            rad = np.radians(np.arange(-30, 31, 15))
+            bullet_pool.spawn(BulletPool.ENEMY,
+                              self.x + self.size//2, self.y + self.size,
+                              np.sin(rad) * 2, np.cos(rad) * 4,
+                              4, self.color, owner=self.entity, damage=self.level * 3)
         else:
             # Standart ateş
-            self.bullets.append({
-                'x': self.x + self.size//2,
-                'y': self.y + self.size,
-                'dx': 0,
-                'dy': 3,
-                'color': self.color,
-                'size': 6
-            })
+            bullet_pool.spawn(BulletPool.ENEMY,
+                              self.x + self.size//2, self.y + self.size,
+                              0, 3, 6, self.color, owner=self.entity, damage=self.level * 3)
     
     def spawn_minions(self):
         # Worm için minion üretme
         for _ in range(2):
             minion = Enemy(EnemyType.BASIC, self.level - 1 if self.level > 1 else 1)
-            minion.x = self.x + random.randint(-20, 20)
+            minion.x = self.x + rng_service.sim.randint(-20, 20)
             minion.y = self.y + self.size
             return minion  # GameManager bunu işleyecek
     
@@ -801,43 +1721,13 @@ class Enemy:
         else:
             alpha = 255
         
-        # Ana gövde
-        s = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        if self.type == EnemyType.GLITCH:
-            # Glitch efekti
-            points = []
-            for i in range(8):
-                angle = math.radians(45 * i + random.randint(-5, 5))
-                radius = self.size//2 + random.randint(-5, 5)
-                points.append((
-                    self.size//2 + math.cos(angle) * radius,
-                    self.size//2 + math.sin(angle) * radius
-                ))
-            pygame.draw.polygon(s, (*self.color[:3], alpha), points)
-        else:
-            pygame.draw.rect(s, (*self.color[:3], alpha), (0, 0, self.size, self.size))
-        
-        surface.blit(s, (self.x, self.y))
+        # Ana gövde ve detaylar önbellekteki sprite'tan gelir
+        surface.blit(enemy_sprites.body(self, alpha), (self.x, self.y))
         
         # Kalkan (Firewall)
         if self.type == EnemyType.FIREWALL and self.shield_health > 0:
-            shield_alpha = 100 + int(155 * (math.sin(pygame.time.get_ticks() * 0.01) * 0.5 + 0.5))
-            shield_surf = pygame.Surface((self.size + 10, self.size + 10), pygame.SRCALPHA)
-            pygame.draw.rect(shield_surf, (*COLORS['matrix_cyan'], shield_alpha),
-                           (0, 0, self.size + 10, self.size + 10), 3)
-            surface.blit(shield_surf, (self.x - 5, self.y - 5))
-        
-        # Detaylar
-        if self.type == EnemyType.HACKER:
-            # Hacker sembolü
-            sym = font.render("⟁", True, COLORS['matrix_white'])
-            surface.blit(sym, (self.x + self.size//2 - sym.get_width()//2,
-                             self.y + self.size//2 - sym.get_height()//2))
-        elif self.type == EnemyType.VIRUS:
-            # Virüs sembolü
-            pygame.draw.circle(surface, COLORS['matrix_white'],
-                             (int(self.x + self.size//2), int(self.y + self.size//2)),
-                             self.size//4)
+            pulse = math.sin(pygame.time.get_ticks() * 0.01) * 0.5 + 0.5
+            surface.blit(enemy_sprites.shield(self.size, pulse), (self.x - 5, self.y - 5))
         
         # Sağlık çubuğu
         if self.health < self.max_health:
@@ -849,11 +1739,10 @@ class Enemy:
                            (self.x, self.y - 8, health_width, health_height))
             pygame.draw.rect(surface, COLORS['matrix_green'],
                            (self.x, self.y - 8, health_width * health_percent, health_height))
-        
-        # Mermileri çiz
-        for bullet in self.bullets:
-            pygame.draw.circle(surface, bullet['color'],
-                             (int(bullet['x']), int(bullet['y'])), bullet['size'])
+
+    def dirty_rects(self):
+        # Gövde, kalkan kenarı ve sağlık çubuğu
+        return [pygame.Rect(self.x - 8, self.y - 10, self.size + 16, self.size + 16)]
 
 # ==================== PLAYER CLASS ====================
 class Player:
@@ -872,7 +1761,6 @@ class Player:
         self.max_combo = 0
         self.combo_timer = 0
         self.invulnerable = 0
-        self.bullets = []
         self.shoot_cooldown = 0
         self.shoot_cooldown_base = 20
         self.damage_multiplier = 1.0
@@ -955,19 +1843,13 @@ class Player:
         if self.shield < self.max_shield:
             self.shield = min(self.max_shield, self.shield + self.shield_regen_rate * time_scale)
         
-        # Mermileri güncelle
-        for bullet in self.bullets[:]:
-            bullet['y'] -= bullet['speed'] * time_scale
-            if bullet['y'] < -10:
-                self.bullets.remove(bullet)
-        
         # İz efekti
         self.trail_timer += time_scale
         if self.trail_timer > 3:
             self.trail_particles.append({
                 'x': self.x + self.width//2,
                 'y': self.y + self.height,
-                'size': random.uniform(2, 4),
+                'size': rng_service.fx.uniform(2, 4),
                 'life': 30,
                 'color': COLORS['matrix_green']
             })
@@ -999,21 +1881,20 @@ class Player:
         if self.powerups['quantum'] > 0:
             bullet_count = 5
         
-        for i in range(bullet_count):
-            offset = (i - (bullet_count - 1) / 2) * 10
-            color = COLORS['matrix_cyan'] if self.powerups['rapid_fire'] > 0 else COLORS['matrix_green']
-            if self.powerups['quantum'] > 0:
-                color = random.choice([COLORS['matrix_cyan'], COLORS['matrix_purple'], COLORS['matrix_orange']])
-            
-            self.bullets.append({
-                'x': self.x + self.width // 2 + offset,
-                'y': self.y,
-                'speed': 10,
-                'color': color,
-                'damage': 10 * self.damage_multiplier,
-                'pierce': self.bullet_pierce,
-                'pierced_enemies': 0
-            })
+        offsets = (np.arange(bullet_count) - (bullet_count - 1) / 2) * 10
+        if self.powerups['quantum'] > 0:
+            colors = [rng_service.fx.choice([COLORS['matrix_cyan'], COLORS['matrix_purple'], COLORS['matrix_orange']])
+                      for _ in range(bullet_count)]
+        elif self.powerups['rapid_fire'] > 0:
+            colors = COLORS['matrix_cyan']
+        else:
+            colors = COLORS['matrix_green']
+        
+        bullet_pool.spawn(BulletPool.PLAYER,
+                          self.x + self.width // 2 + offsets, self.y,
+                          0, -10, 0, colors,
+                          damage=10 * self.damage_multiplier,
+                          pierce=self.bullet_pierce)
         
         self.stats['shots_fired'] += bullet_count
         self.shoot_cooldown = self.shoot_cooldown_base
@@ -1080,7 +1961,7 @@ class Player:
         # Titreme efekti (hasar aldığında)
         shake = 0
         if self.invulnerable > 0 and self.invulnerable % 4 < 2:
-            shake = random.randint(-2, 2)
+            shake = rng_service.fx.randint(-2, 2)
         
         # Gemi gövdesi
         ship_color = COLORS['matrix_green']
@@ -1093,7 +1974,7 @@ class Player:
                            [(p[0] + shake, p[1] + shake) for p in points])
         
         # Motor ateşi
-        fire_height = random.randint(5, 10)
+        fire_height = rng_service.fx.randint(5, 10)
         fire_points = [
             (self.x + self.width // 3, self.y + self.height),
             (self.x + self.width // 2, self.y + self.height + fire_height),
@@ -1101,35 +1982,40 @@ class Player:
         ]
         fire_color = COLORS['matrix_yellow']
         if self.powerups['quantum'] > 0:
-            fire_color = random.choice([COLORS['matrix_cyan'], COLORS['matrix_purple']])
+            fire_color = rng_service.fx.choice([COLORS['matrix_cyan'], COLORS['matrix_purple']])
         
         pygame.draw.polygon(surface, fire_color, fire_points)
         
-        # Mermileri çiz
-        for bullet in self.bullets:
-            size = 6 if self.powerups['quantum'] > 0 else 4
-            pygame.draw.rect(surface, bullet['color'],
-                           (bullet['x'] - size//2, bullet['y'] - size*2, size, size*3))
-        
         # Matrix Vision efekti
         if self.matrix_vision:
-            vision_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            vision_surf = surface_pool.get('matrix_vision', (WIDTH, HEIGHT), pygame.SRCALPHA)
+            vision_surf.fill((0, 0, 0, 0))
             for _ in range(20):
-                x1 = random.randint(0, WIDTH)
-                y1 = random.randint(0, HEIGHT)
-                x2 = x1 + random.randint(-50, 50)
-                y2 = y1 + random.randint(-50, 50)
+                x1 = rng_service.fx.randint(0, WIDTH)
+                y1 = rng_service.fx.randint(0, HEIGHT)
+                x2 = x1 + rng_service.fx.randint(-50, 50)
+                y2 = y1 + rng_service.fx.randint(-50, 50)
                 pygame.draw.line(vision_surf, (*COLORS['matrix_cyan'], 50),
                                (x1, y1), (x2, y2), 1)
             surface.blit(vision_surf, (0, 0))
 
+    def dirty_rects(self):
+        rects = [pygame.Rect(self.x - 12, self.y - 12, self.width + 24, self.height + 34)]
+        for particle in self.trail_particles:
+            size = int(particle['size']) + 1
+            rects.append(pygame.Rect(particle['x'] - size, particle['y'] - size, size * 2, size * 2))
+        return rects
+    
+    def bullet_size(self):
+        return 6 if self.powerups['quantum'] > 0 else 4
+
 # ==================== POWERUP SYSTEM ====================
 class PowerUp:
     def __init__(self, x, y, powerup_type=None):
         self.x = x
         self.y = y
         self.size = 15
-        self.type = powerup_type or random.choice(list(PowerUpType))
+        self.type = powerup_type or rng_service.sim.choice(list(PowerUpType))
         self.speed = 2
         self.lifetime = 600
         self.collected = False
@@ -1218,6 +2104,10 @@ class PowerUp:
                     (self.x - symbol_surf.get_width() // 2,
                      self.y - symbol_surf.get_height() // 2))
 
+    def dirty_rects(self):
+        radius = int(self.size * 1.8) + 2
+        return [pygame.Rect(self.x - radius, self.y - radius, radius * 2, radius * 2)]
+
 # ==================== WEATHER SYSTEM ====================
 class WeatherSystem:
     def __init__(self):
@@ -1242,34 +2132,48 @@ class WeatherSystem:
             self.create_cyber_snow(intensity)
     
     def create_data_rain(self, intensity):
-        for _ in range(int(100 * intensity)):
-            self.particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(-100, 0),
-                'char': random.choice(MATRIX_CHARS),
-                'speed': random.uniform(2, 6) * intensity,
-                'color': random.choice([
-                    COLORS['matrix_green'],
-                    COLORS['matrix_cyan'],
-                    COLORS['matrix_blue']
-                ]),
-                'life': random.randint(100, 300),
-                'size': random.uniform(0.8, 1.2)
-            })
+        # Tüm alanlar tek seferde NumPy ile üretilir
+        count = int(100 * intensity)
+        rng = rng_service.np_fx
+        colors = [COLORS['matrix_green'], COLORS['matrix_cyan'], COLORS['matrix_blue']]
+        self.particles.extend({
+            'x': x,
+            'y': y,
+            'char': MATRIX_CHARS[char],
+            'speed': speed,
+            'color': colors[color],
+            'life': life,
+            'size': size
+        } for x, y, char, speed, color, life, size in zip(
+            rng.integers(0, WIDTH + 1, count).tolist(),
+            rng.integers(-100, 1, count).tolist(),
+            rng.integers(0, len(MATRIX_CHARS), count).tolist(),
+            (rng.uniform(2, 6, count) * intensity).tolist(),
+            rng.integers(0, len(colors), count).tolist(),
+            rng.integers(100, 301, count).tolist(),
+            rng.uniform(0.8, 1.2, count).tolist()))
     
     def create_glitch_storm(self, intensity):
-        for _ in range(int(50 * intensity)):
-            self.particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'char': random.choice(MATRIX_CHARS),
-                'speed_x': random.uniform(-3, 3) * intensity,
-                'speed_y': random.uniform(-3, 3) * intensity,
-                'color': COLORS['matrix_purple'],
-                'life': random.randint(60, 180),
-                'glitch': True,
-                'glitch_timer': random.randint(0, 30)
-            })
+        count = int(50 * intensity)
+        rng = rng_service.np_fx
+        self.particles.extend({
+            'x': x,
+            'y': y,
+            'char': MATRIX_CHARS[char],
+            'speed_x': speed_x,
+            'speed_y': speed_y,
+            'color': COLORS['matrix_purple'],
+            'life': life,
+            'glitch': True,
+            'glitch_timer': glitch_timer
+        } for x, y, char, speed_x, speed_y, life, glitch_timer in zip(
+            rng.integers(0, WIDTH + 1, count).tolist(),
+            rng.integers(0, HEIGHT + 1, count).tolist(),
+            rng.integers(0, len(MATRIX_CHARS), count).tolist(),
+            (rng.uniform(-3, 3, count) * intensity).tolist(),
+            (rng.uniform(-3, 3, count) * intensity).tolist(),
+            rng.integers(60, 181, count).tolist(),
+            rng.integers(0, 31, count).tolist()))
     
     def create_matrix_overload(self, intensity):
         # Ekran titremesi efekti
@@ -1281,10 +2185,10 @@ class WeatherSystem:
         
         # Rastgele glitch çizgileri
         for _ in range(int(20 * intensity)):
-            x1 = random.randint(0, WIDTH)
-            y1 = random.randint(0, HEIGHT)
-            length = random.randint(50, 200) * intensity
-            angle = random.uniform(0, math.pi * 2)
+            x1 = rng_service.fx.randint(0, WIDTH)
+            y1 = rng_service.fx.randint(0, HEIGHT)
+            length = rng_service.fx.randint(50, 200) * intensity
+            angle = rng_service.fx.uniform(0, math.pi * 2)
             x2 = x1 + math.cos(angle) * length
             y2 = y1 + math.sin(angle) * length
             
@@ -1292,22 +2196,29 @@ class WeatherSystem:
                 'type': 'glitch_line',
                 'x1': x1, 'y1': y1,
                 'x2': x2, 'y2': y2,
-                'color': random.choice([COLORS['matrix_red'], COLORS['matrix_purple']]),
-                'life': random.randint(10, 30)
+                'color': rng_service.fx.choice([COLORS['matrix_red'], COLORS['matrix_purple']]),
+                'life': rng_service.fx.randint(10, 30)
             })
     
     def create_cyber_snow(self, intensity):
-        for _ in range(int(200 * intensity)):
-            self.particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(-50, 0),
-                'char': '·',
-                'speed': random.uniform(1, 3) * intensity,
-                'color': COLORS['matrix_cyan'],
-                'life': random.randint(150, 400),
-                'drift': random.uniform(-0.5, 0.5),
-                'size': random.uniform(0.5, 1.5)
-            })
+        count = int(200 * intensity)
+        rng = rng_service.np_fx
+        self.particles.extend({
+            'x': x,
+            'y': y,
+            'char': '·',
+            'speed': speed,
+            'color': COLORS['matrix_cyan'],
+            'life': life,
+            'drift': drift,
+            'size': size
+        } for x, y, speed, life, drift, size in zip(
+            rng.integers(0, WIDTH + 1, count).tolist(),
+            rng.integers(-50, 1, count).tolist(),
+            (rng.uniform(1, 3, count) * intensity).tolist(),
+            rng.integers(150, 401, count).tolist(),
+            rng.uniform(-0.5, 0.5, count).tolist(),
+            rng.uniform(0.5, 1.5, count).tolist()))
     
     def update(self):
         self.weather_timer = max(0, self.weather_timer - 1)
@@ -1322,29 +2233,29 @@ class WeatherSystem:
             if self.current_weather == WeatherType.DATA_RAIN:
                 particle['y'] += particle['speed']
                 if particle['y'] > HEIGHT:
-                    particle['y'] = random.randint(-100, 0)
-                    particle['x'] = random.randint(0, WIDTH)
+                    particle['y'] = rng_service.fx.randint(-100, 0)
+                    particle['x'] = rng_service.fx.randint(0, WIDTH)
                     
             elif self.current_weather == WeatherType.GLITCH_STORM:
                 particle['x'] += particle['speed_x']
                 particle['y'] += particle['speed_y']
                 particle['glitch_timer'] -= 1
                 if particle['glitch_timer'] <= 0:
-                    particle['char'] = random.choice(MATRIX_CHARS)
-                    particle['glitch_timer'] = random.randint(10, 30)
+                    particle['char'] = rng_service.fx.choice(MATRIX_CHARS)
+                    particle['glitch_timer'] = rng_service.fx.randint(10, 30)
                 
                 # Ekran sınırları
                 if particle['x'] < -100 or particle['x'] > WIDTH + 100:
-                    particle['x'] = random.randint(0, WIDTH)
+                    particle['x'] = rng_service.fx.randint(0, WIDTH)
                 if particle['y'] < -100 or particle['y'] > HEIGHT + 100:
-                    particle['y'] = random.randint(0, HEIGHT)
+                    particle['y'] = rng_service.fx.randint(0, HEIGHT)
                     
             elif self.current_weather == WeatherType.CYBER_SNOW:
                 particle['y'] += particle['speed']
                 particle['x'] += particle['drift']
                 if particle['y'] > HEIGHT:
-                    particle['y'] = random.randint(-50, 0)
-                    particle['x'] = random.randint(0, WIDTH)
+                    particle['y'] = rng_service.fx.randint(-50, 0)
+                    particle['x'] = rng_service.fx.randint(0, WIDTH)
             
             particle['life'] -= 1
             if particle['life'] <= 0:
@@ -1359,16 +2270,14 @@ class WeatherSystem:
     def draw(self, surface):
         for particle in self.particles:
             alpha = min(255, particle['life'] * 2)
-            color = (*particle['color'][:3], alpha)
             
             if 'size' in particle:
-                size = particle['size']
-                char_surf = pygame.font.Font(None, int(FONT_SIZE * size)).render(
-                    particle['char'], True, color)
+                atlas = weather_font_cache.atlas(FONT_SIZE * particle['size'])
             else:
-                char_surf = font.render(particle['char'], True, color)
+                atlas = glyph_atlas
             
-            surface.blit(char_surf, (int(particle['x']), int(particle['y'])))
+            atlas.blit(surface, particle['char'], particle['color'],
+                       (int(particle['x']), int(particle['y'])), alpha)
         
         for effect in self.effects:
             if effect['type'] == 'glitch_line':
@@ -1378,6 +2287,20 @@ class WeatherSystem:
                                (effect['x1'], effect['y1']),
                                (effect['x2'], effect['y2']), 2)
     
+    def dirty_rects(self):
+        rects = []
+        for particle in self.particles:
+            box = int(FONT_SIZE * particle.get('size', 1.0) * 1.5)
+            rects.append(pygame.Rect(particle['x'], particle['y'], box, box))
+        for effect in self.effects:
+            if effect['type'] == 'glitch_line':
+                left = min(effect['x1'], effect['x2'])
+                top = min(effect['y1'], effect['y2'])
+                rects.append(pygame.Rect(left - 2, top - 2,
+                                         abs(effect['x2'] - effect['x1']) + 4,
+                                         abs(effect['y2'] - effect['y1']) + 4))
+        return rects
+    
     def get_screen_shake(self):
         for effect in self.effects:
             if effect['type'] == 'screen_shake':
@@ -1386,114 +2309,145 @@ class WeatherSystem:
 
 # ==================== MATRIX RAIN BACKGROUND ====================
 class MatrixRain:
+    MAX_LENGTH = 20
+    BRIGHTNESS_LEVELS = 8
+    SHIFT_INTERVAL = 80  # ms
+
     def __init__(self, intensity=1.0):
-        self.columns = []
         self.intensity = intensity
         self.column_spacing = 20
+        self.rng = rng_service.np_fx
+        self.char_count = len(MATRIX_CHARS)
+        self.build_palette()
         self.setup_columns()
-        self.glow_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         self.scanline_pos = 0
         self.scanline_speed = 3
-    
-    def setup_columns(self):
-        num_columns = int(WIDTH // self.column_spacing * self.intensity)
-        for i in range(num_columns):
-            x = random.randint(0, WIDTH)
-            speed = random.uniform(1, 4) * self.intensity
-            length = random.randint(5, 20)
-            sparkle = random.random() > 0.7
-            self.columns.append(MatrixColumn(x, speed, length, sparkle))
-    
-    def update(self, time_scale=1.0):
-        for column in self.columns:
-            column.update(time_scale)
-            if column.y > HEIGHT + column.length * FONT_SIZE:
-                column.reset()
-        
-        self.scanline_pos += self.scanline_speed * time_scale
-        if self.scanline_pos > HEIGHT + 50:
-            self.scanline_pos = -50
-    
+        self.ticks = 0
+        self.last_time_scale = 1.0
+
+    def build_palette(self):
+        # Satır rengi (sınıf) ve parlaklık seviyesi -> palet girişi
+        classes = [
+            COLORS['matrix_white'],
+            COLORS['matrix_light_green'],
+            COLORS['matrix_green'],
+            tuple(int(c * 0.4) for c in COLORS['matrix_green'])
+        ]
+        levels = self.BRIGHTNESS_LEVELS
+        self.palette = [
+            tuple(int(c * level / (levels - 1)) for c in color)
+            for color in classes
+            for level in range(levels)
+        ]
+
+        # Kolon uzunluğu ve satır indeksine göre palet tablosu
+        rows = np.arange(self.MAX_LENGTH)
+        row_class = np.select([rows == 0, rows < 3, rows < 6], [0, 1, 2], 3)
+        lengths = np.arange(self.MAX_LENGTH + 1)[:, None]
+        brightness = np.clip(1.0 - rows[None, :] / np.maximum(lengths, 1), 0.0, 1.0)
+        level = np.rint(brightness * (levels - 1)).astype(np.int32)
+        self.palette_lut = (row_class[None, :] * levels + level).astype(np.int32)
+
+        # Kullanılan her palet girişi için tüm karakterleri bir kez boya
+        used = np.unique(self.palette_lut[5:])
+        self.sprites = [None] * (len(self.palette) * self.char_count)
+        for entry in used.tolist():
+            color = self.palette[entry]
+            base = entry * self.char_count
+            for i, char in enumerate(MATRIX_CHARS):
+                self.sprites[base + i] = glyph_atlas.tint(char, color)
+
+        self.glow_sprite = pygame.Surface((FONT_SIZE, FONT_SIZE), pygame.SRCALPHA)
+        pygame.draw.circle(self.glow_sprite, (*COLORS['matrix_white'], 100),
+                          (FONT_SIZE//2, FONT_SIZE//2), FONT_SIZE//2)
+
+    def setup_columns(self, num_columns=None):
+        if num_columns is None:
+            num_columns = int(WIDTH // self.column_spacing * self.intensity)
+        rng = self.rng
+        self.count = num_columns
+        self.x = rng.integers(0, WIDTH + 1, num_columns).astype(np.float64)
+        self.speed = rng.uniform(1, 4, num_columns) * self.intensity
+        self.length = rng.integers(5, 21, num_columns).astype(np.int32)
+        self.sparkle = rng.random(num_columns) > 0.7
+        self.y = np.zeros(num_columns)
+        self.head = np.zeros(num_columns, dtype=np.int32)
+        self.glyphs = np.zeros((num_columns, self.MAX_LENGTH), dtype=np.int32)
+        self.last_shift = np.full(num_columns, pygame.time.get_ticks(), dtype=np.int64)
+        self.reset_columns(np.arange(num_columns))
+
+    def reset_columns(self, idx):
+        self.y[idx] = self.rng.integers(-HEIGHT, 1, idx.size)
+        self.head[idx] = 0
+        self.glyphs[idx] = self.rng.integers(0, self.char_count, (idx.size, self.MAX_LENGTH))
+
+    def update(self, time_scale=1.0):
+        self.ticks += 1
+        self.last_time_scale = time_scale
+        self.y += self.speed * time_scale
+
+        # Süresi dolan kolonlarda en öndeki karakter düşer, sona yenisi eklenir
+        now = pygame.time.get_ticks()
+        due = np.flatnonzero(now - self.last_shift > self.SHIFT_INTERVAL)
+        if due.size:
+            heads = self.head[due]
+            self.glyphs[due, heads] = self.rng.integers(0, self.char_count, due.size)
+            self.head[due] = (heads + 1) % self.length[due]
+            self.last_shift[due] = now
+
+        done = np.flatnonzero(self.y > HEIGHT + self.length * FONT_SIZE)
+        if done.size:
+            self.reset_columns(done)
+
+        self.scanline_pos += self.scanline_speed * time_scale
+        if self.scanline_pos > HEIGHT + 50:
+            self.scanline_pos = -50
+
     def draw(self, surface):
         # Yarı saydam siyah katman
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        surface.blit(overlay, (0, 0))
-        
-        # Kod yağmuru
-        for column in self.columns:
-            column.draw(surface)
-        
+        surface.blit(surface_pool.filled((0, 0, 0, 200), (WIDTH, HEIGHT)), (0, 0))
+
+        # Kod yağmuru - görünür glifler tek adımda seçilir
+        visible, glyph_y = self.visible_glyphs()
+        cols, idx = np.nonzero(visible)
+
+        chars = self.glyphs[cols, (self.head[cols] + idx) % self.length[cols]]
+        keys = self.palette_lut[self.length[cols], idx] * self.char_count + chars
+
+        sprites = self.sprites
+        blits = []
+        glow = self.glow_sprite
+        for col in np.flatnonzero(self.sparkle & visible[:, 0]).tolist():
+            blits.append((glow, (self.x[col] - FONT_SIZE//2, self.y[col] - FONT_SIZE//2)))
+        blits.extend([
+            (sprites[key], (x, y))
+            for key, x, y in zip(keys.tolist(), self.x[cols].tolist(), glyph_y[cols, idx].tolist())
+        ])
+        surface.blits(blits, False)
+
         # Hafif tarama çizgisi
-        scanline = pygame.Surface((WIDTH, 30), pygame.SRCALPHA)
-        scanline.fill((0, 100, 0, 30))
+        scanline = surface_pool.filled((0, 100, 0, 30), (WIDTH, 30))
         surface.blit(scanline, (0, self.scanline_pos - 15))
 
-class MatrixColumn:
-    def __init__(self, x, speed, length, sparkle):
-        self.x = x
-        self.speed = speed
-        self.length = length
-        self.sparkle = sparkle
-        self.reset()
-        self.last_update = pygame.time.get_ticks()
-    
-    def reset(self):
-        self.y = random.randint(-HEIGHT, 0)
-        self.chars = [random.choice(MATRIX_CHARS) for _ in range(self.length)]
-        self.brightness = [1.0] * self.length
-        self.colors = [self.get_char_color(i) for i in range(self.length)]
-    
-    def get_char_color(self, index):
-        if index == 0:
-            return COLORS['matrix_white']
-        elif index < 3:
-            return COLORS['matrix_light_green']
-        elif index < 6:
-            return COLORS['matrix_green']
-        else:
-            dark_green = tuple(int(c * 0.4) for c in COLORS['matrix_green'])
-            return dark_green
-    
-    def update(self, time_scale):
-        current_time = pygame.time.get_ticks()
-        
-        self.y += self.speed * time_scale
-        
-        if current_time - self.last_update > 80:
-            self.chars.pop(0)
-            self.chars.append(random.choice(MATRIX_CHARS))
-            self.last_update = current_time
-            
-            self.brightness.insert(0, 1.0)
-            if len(self.brightness) > self.length:
-                self.brightness = self.brightness[:self.length]
-            
-            # Rastgele renk değişimi
-            if random.random() < 0.1:
-                self.colors = [self.get_char_color(i) for i in range(self.length)]
-    
-    def draw(self, surface):
-        for i in range(min(self.length, len(self.chars))):
-            char = self.chars[i]
-            brightness = self.brightness[i] * (1.0 - i/self.length)
-            color = self.colors[i]
-            
-            # Parlaklık uygula
-            actual_color = tuple(int(c * brightness) for c in color)
-            
-            if i == 0 and self.sparkle:
-                glow_surf = pygame.Surface((FONT_SIZE, FONT_SIZE), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surf, (*actual_color, 100),
-                                  (FONT_SIZE//2, FONT_SIZE//2),
-                                  FONT_SIZE//2)
-                surface.blit(glow_surf,
-                            (self.x - FONT_SIZE//2,
-                             self.y - i * FONT_SIZE - FONT_SIZE//2))
-            
-            char_surface = font.render(char, True, actual_color)
-            surface.blit(char_surface,
-                        (self.x, self.y - i * FONT_SIZE))
+    def visible_glyphs(self):
+        # (kolon, satır) görünürlük maskesi ve her glifin ekran y'si
+        rows = np.arange(self.MAX_LENGTH)
+        glyph_y = self.y[:, None] - rows[None, :] * FONT_SIZE
+        visible = ((rows[None, :] < self.length[:, None]) &
+                   (glyph_y > -FONT_SIZE) & (glyph_y < HEIGHT))
+        return visible, glyph_y
+
+    def dirty_rects(self):
+        # Her kolon için baştaki parıltıdan kuyruğa kadar dikey şerit
+        tops = self.y - self.length * FONT_SIZE
+        left = (self.x - FONT_SIZE//2).tolist()
+        rects = [
+            pygame.Rect(x, top, FONT_SIZE + FONT_SIZE//2, length * FONT_SIZE + FONT_SIZE)
+            for x, top, length in zip(left, tops.tolist(), self.length.tolist())
+            if top < HEIGHT and top + length * FONT_SIZE + FONT_SIZE > 0
+        ]
+        rects.append(pygame.Rect(0, self.scanline_pos - 15, WIDTH, 30))
+        return rects
 
 # ==================== TIME MANIPULATION ====================
 class TimeManipulation:
@@ -1545,7 +2499,8 @@ class TimeManipulation:
         for effect in self.effects:
             if effect['type'] == 'time_wave':
                 alpha = max(0, 100 - (effect['radius'] / effect['max_radius']) * 100)
-                wave_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+                wave_surf = surface_pool.get('time_wave', (WIDTH, HEIGHT), pygame.SRCALPHA)
+                wave_surf.fill((0, 0, 0, 0))
                 pygame.draw.circle(wave_surf, (*effect['color'], alpha),
                                   (WIDTH//2, HEIGHT//2), effect['radius'], 5)
                 surface.blit(wave_surf, (0, 0))
@@ -1580,7 +2535,7 @@ class AIAssistant:
         if not self.active or self.message_timer > 0:
             return
         
-        tip = random.choice(self.tips)
+        tip = rng_service.fx.choice(self.tips)
         self.messages.append({
             'text': tip,
             'color': COLORS['matrix_cyan'],
@@ -1603,7 +2558,7 @@ class AIAssistant:
         elif game_situation['accuracy'] < 0.3:
             tip = "Aim for accuracy! Every shot counts!"
         else:
-            tip = random.choice(self.tips)
+            tip = rng_service.fx.choice(self.tips)
         
         self.messages.append({
             'text': tip,
@@ -1636,6 +2591,14 @@ class AIAssistant:
             surface.blit(text_surf, (30, y_offset))
             y_offset -= 35
 
+    def dirty_rects(self):
+        rects = []
+        y_offset = HEIGHT - 100
+        for message in reversed(self.messages[-3:]):
+            rects.append(pygame.Rect(20, y_offset - 5, font.size(message['text'])[0] + 20, 30))
+            y_offset -= 35
+        return rects
+
 # ==================== STATISTICS & ACHIEVEMENTS ====================
 class Statistics:
     def __init__(self):
@@ -1774,9 +2737,7 @@ class Statistics:
     
     def draw_full_stats(self, surface):
         # Arkaplan
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        surface.blit(overlay, (0, 0))
+        surface.blit(surface_pool.filled((0, 0, 0, 200), (WIDTH, HEIGHT)), (0, 0))
         
         # Ana kutu
         stats_rect = pygame.Rect(100, 50, WIDTH - 200, HEIGHT - 100)
@@ -1908,18 +2869,15 @@ class CutsceneManager:
             return
         
         # Karanlık arkaplan
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        surface.blit(overlay, (0, 0))
+        surface.blit(surface_pool.filled((0, 0, 0, 200), (WIDTH, HEIGHT)), (0, 0))
         
         # Matrix efekti arkaplan
         for _ in range(20):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
-            char = random.choice(MATRIX_CHARS)
-            color = random.choice([COLORS['matrix_green'], COLORS['matrix_cyan']])
-            char_surf = small_font.render(char, True, (*color, 100))
-            surface.blit(char_surf, (x, y))
+            x = rng_service.fx.randint(0, WIDTH)
+            y = rng_service.fx.randint(0, HEIGHT)
+            char = rng_service.fx.choice(MATRIX_CHARS)
+            color = rng_service.fx.choice([COLORS['matrix_green'], COLORS['matrix_cyan']])
+            small_glyph_atlas.blit(surface, char, color, (x, y), 100)
         
         # Metin kutusu
         text_box = pygame.Rect(100, HEIGHT//2 - 100, WIDTH - 200, 200)
@@ -1947,9 +2905,828 @@ class CutsceneManager:
             continue_text = font.render("PRESS ANY KEY TO CONTINUE", True, COLORS['matrix_cyan'])
             surface.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, HEIGHT - 100))
 
+# ==================== DIRTY RECT RENDERING ====================
+class DirtyRectTracker:
+    def __init__(self, full_ratio=0.6, cell_size=32):
+        self.full_ratio = full_ratio
+        self.cell_size = cell_size
+        self.current = []
+        self.previous = None  # None: bir sonraki kare tam ekran çizilir
+
+    def invalidate(self):
+        self.current = []
+        self.previous = None
+
+    def add(self, rect):
+        self.current.append(rect)
+
+    def extend(self, rects):
+        self.current.extend(rects)
+
+    def finish_frame(self, bounds):
+        current = [rect.clip(bounds) for rect in self.current]
+        current = [rect for rect in current if rect.width > 0 and rect.height > 0]
+        previous = self.previous
+        self.previous = current
+        self.current = []
+
+        if previous is None:
+            return None
+
+        # Önceki karenin alanları da silinmek için güncellenir
+        cell = self.cell_size
+        grid = np.zeros(((bounds.height + cell - 1) // cell, (bounds.width + cell - 1) // cell), dtype=bool)
+        for rect in previous:
+            grid[rect.top // cell:(rect.bottom - 1) // cell + 1, rect.left // cell:(rect.right - 1) // cell + 1] = True
+        for rect in current:
+            grid[rect.top // cell:(rect.bottom - 1) // cell + 1, rect.left // cell:(rect.right - 1) // cell + 1] = True
+        
+        if grid.sum() > self.full_ratio * grid.size:
+            return None
+        return self.merge_cells(grid, bounds)
+
+    def merge_cells(self, grid, bounds):
+        # Satırlardaki ardışık hücreleri birleştir, aynı aralıkları alt alta uzat
+        cell = self.cell_size
+        rects = []
+        open_runs = {}
+        for row in range(grid.shape[0]):
+            padded = np.concatenate(([False], grid[row], [False]))
+            edges = np.flatnonzero(padded[1:] != padded[:-1]).tolist()
+            runs = {}
+            for start, end in zip(edges[::2], edges[1::2]):
+                rect = open_runs.pop((start, end), None)
+                if rect is None:
+                    rect = pygame.Rect(start * cell, row * cell, (end - start) * cell, cell)
+                    rects.append(rect)
+                else:
+                    rect.height += cell
+                runs[(start, end)] = rect
+            open_runs = runs
+        return [rect.clip(bounds) for rect in rects]
+
+# ==================== FIXED TIMESTEP ====================
+class FixedTimestep:
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCH_UP_TICKS):
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped_ticks = 0
+    
+    def reset(self):
+        self.accumulator = 0.0
+        self.last_time = None
+    
+    def advance(self, now=None):
+        # Geçen gerçek zamanı biriktirip çalıştırılacak tik sayısını döndürür
+        if now is None:
+            now = time.perf_counter()
+        if self.last_time is None:
+            self.last_time = now
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Yetişilemeyen süre atılır; oyun yalnızca bu sınırın ötesinde yavaşlar
+            self.dropped_ticks += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.dt * steps
+        self.accumulator -= self.dt * steps
+        return steps
+    
+    def remaining(self, now=None):
+        # Sıradaki tikin zamanı gelene kadar kalan gerçek süre (s); gecikmişse negatif
+        if now is None:
+            now = time.perf_counter()
+        if self.last_time is None:
+            return self.dt
+        return self.dt - self.accumulator - (now - self.last_time)
+    
+    @property
+    def alpha(self):
+        # Son iki tik arasındaki çizim konumu (0..1)
+        return min(1.0, self.accumulator / self.dt)
+
+class Interpolator:
+    def __init__(self):
+        self.player = None
+        self.boss = None
+        self.enemies = {}
+        self.bullet_ticks = 0
+        self.particle_ticks = 0
+        self.rain_ticks = 0
+    
+    def capture(self, gm):
+        # Tikten önceki konumlar
+        self.player = (gm.player, gm.player.x, gm.player.y)
+        self.boss = (gm.boss, gm.boss.x, gm.boss.y) if gm.boss else None
+        self.enemies = {}
+        for arch in gm.world.query('kinematics'):
+            # Kimliğe göre sıralı saklanır; apply searchsorted ile eşler
+            view = arch.view()
+            ids = np.array(arch.ids, dtype=np.int64)
+            order = np.argsort(ids)
+            self.enemies[arch] = (ids[order], view['x'][order], view['y'][order])
+        self.bullet_ticks = bullet_pool.ticks
+        self.particle_ticks = gm.particle_system.ticks
+        self.rain_ticks = gm.matrix_rain.ticks
+    
+    def apply(self, gm, alpha):
+        # Konumları geçici olarak ara değere çeker; geri almak için kayıt döndürür
+        saved = []
+        beta = 1.0 - alpha
+        
+        for entry in (self.player, self.boss):
+            if entry is None:
+                continue
+            obj, prev_x, prev_y = entry
+            if obj is gm.player or obj is gm.boss:
+                saved.append((obj, 'x', obj.x))
+                saved.append((obj, 'y', obj.y))
+                obj.x = prev_x + (obj.x - prev_x) * alpha
+                obj.y = prev_y + (obj.y - prev_y) * alpha
+        
+        for arch, (prev_ids, prev_x, prev_y) in self.enemies.items():
+            if not arch.count or not len(prev_ids):
+                continue
+            ids = np.array(arch.ids, dtype=np.int64)
+            # Swap-remove satırların yerini değiştirir: hayatta kalanlar kimlikle eşleşir
+            previous = np.minimum(np.searchsorted(prev_ids, ids), len(prev_ids) - 1)
+            current = np.flatnonzero(prev_ids[previous] == ids)
+            previous = previous[current]
+            view = arch.view()
+            x, y = view['x'], view['y']
+            saved.append((x, None, x.copy()))
+            saved.append((y, None, y.copy()))
+            x[current] = prev_x[previous] + (x[current] - prev_x[previous]) * alpha
+            y[current] = prev_y[previous] + (y[current] - prev_y[previous]) * alpha
+        
+        # Mermi ve parçacıklar son tikteki hızlarıyla geri çekilir
+        pool = bullet_pool
+        if pool.ticks != self.bullet_ticks and pool.count:
+            n = pool.count
+            step = np.where(pool.faction[:n] == BulletPool.PLAYER, pool.last_time_scale, 1.0) * beta
+            x, y = pool.x[:n], pool.y[:n]
+            saved.append((x, None, x.copy()))
+            saved.append((y, None, y.copy()))
+            x -= pool.dx[:n] * step
+            y -= pool.dy[:n] * step
+        
+        particles = gm.particle_system
+        if particles.ticks != self.particle_ticks and particles.count:
+            n = particles.count
+            x, y = particles.x[:n], particles.y[:n]
+            saved.append((x, None, x.copy()))
+            saved.append((y, None, y.copy()))
+            x -= particles.vx[:n] * beta
+            y -= particles.vy[:n] * beta
+        
+        rain = gm.matrix_rain
+        if rain.ticks != self.rain_ticks:
+            saved.append((rain, 'y', rain.y))
+            rain.y = rain.y - rain.speed * (rain.last_time_scale * beta)
+        
+        return saved
+    
+    def restore(self, saved):
+        # Öznitelikler setattr ile, diziler yerinde geri yazılır
+        for target, name, value in reversed(saved):
+            if name is None:
+                target[:] = value
+            else:
+                setattr(target, name, value)
+
+# ==================== FRAME PROFILER ====================
+class ProfileSection:
+    # column -1: sadece iz kaydına giren kapsayıcı aralık (çubuklara eklenmez).
+    # Ad başına tek nesne paylaşılır; iç içe girişler için başlangıçlar yığında tutulur
+    __slots__ = ('profiler', 'name', 'column', 'starts')
+    
+    def __init__(self, profiler, name, column):
+        self.profiler = profiler
+        self.name = name
+        self.column = column
+        self.starts = []
+    
+    def __enter__(self):
+        self.starts.append(time.perf_counter())
+        return self
+    
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        start = self.starts.pop()
+        profiler = self.profiler
+        # Aynı adın iç içe girişinde süre çubuğa yalnızca en dıştaki çıkışta eklenir
+        if profiler.enabled and self.column >= 0 and not self.starts:
+            profiler.row[self.column] += end - start
+        if profiler.tracer is not None:
+            profiler.tracer.span(self.name, start, end)
+        return False
+
+class TraceRecorder:
+    # Aralıklar sabit boyutlu halka tamponda tutulur; dolunca en eskiler ezilir
+    def __init__(self, capacity=1 << 18, instants=4096):
+        self.capacity = capacity
+        self.name_ids = {}
+        self.names = []
+        self.ids = np.zeros(capacity, dtype=np.int32)
+        self.starts = np.zeros(capacity)
+        self.ends = np.zeros(capacity)
+        self.count = 0
+        self.instants = deque(maxlen=instants)
+        self.origin = time.perf_counter()
+    
+    def span(self, name, start, end):
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        i = self.count % self.capacity
+        self.ids[i] = name_id
+        self.starts[i] = start
+        self.ends[i] = end
+        self.count += 1
+    
+    def instant(self, name, **args):
+        self.instants.append((time.perf_counter(), name, args))
+    
+    def events(self):
+        n = min(self.count, self.capacity)
+        order = np.arange(self.count - n, self.count) % self.capacity
+        starts = self.starts[order]
+        ends = self.ends[order]
+        ids = self.ids[order]
+        # Aynı anda başlayanlarda uzun olan (ebeveyn) önce gelir
+        order = np.lexsort((starts - ends, starts))
+        ts = np.round((starts[order] - self.origin) * 1e6, 3).tolist()
+        dur = np.round((ends[order] - starts[order]) * 1e6, 3).tolist()
+        names = [self.names[i] for i in ids[order].tolist()]
+        
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1,
+                   'args': {'name': 'main loop'}}]
+        events.extend({'name': name, 'ph': 'X', 'ts': t, 'dur': d, 'pid': 1, 'tid': 1}
+                      for name, t, d in zip(names, ts, dur))
+        events.extend({'name': name, 'ph': 'i', 's': 'g', 'pid': 1, 'tid': 1,
+                       'ts': round((t - self.origin) * 1e6, 3), 'args': args}
+                      for t, name, args in self.instants)
+        return events
+    
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f)
+        return path
+
+class FrameProfiler:
+    MAX_SECTIONS = 32
+    BUDGET_MS = 1000.0 / 60
+    GRAPH_HEIGHT = 100
+    GRAPH_FRAMES = 160
+    PANEL_WIDTH = 340
+    
+    def __init__(self, history=240):
+        # Her kare bir satır, her alt sistem bir sütun (saniye)
+        self.history = history
+        self.times = np.zeros((history, self.MAX_SECTIONS))
+        self.totals = np.zeros(history)
+        self.index = 0
+        self.filled = 0
+        self.row = self.times[0]
+        self.sections = {}
+        self.spans = {}
+        self.names = []
+        self.enabled = False  # süre toplama (kaplama veya bekçi açıkken)
+        self.visible = False
+        self.watchdog = False
+        self.frames = 0
+        self.tracer = None
+        self.frame_start = 0.0
+        self.counts = {}
+        self.p95 = np.zeros(self.MAX_SECTIONS + 1)
+        self.text_surface = None
+        self.text_timer = 0
+        self.graph_surface = None
+        self.colors = []
+    
+    def toggle(self):
+        self.visible = not self.visible
+        self.text_surface = None
+        self.graph_surface = None
+        self.collect(self.visible or self.watchdog)
+    
+    def collect(self, enabled):
+        # Toplama yeniden açılınca eski kareler atılır
+        if enabled and not self.enabled:
+            self.times[:] = 0
+            self.totals[:] = 0
+            self.index = 0
+            self.filled = 0
+            self.row = self.times[0]
+        self.enabled = enabled
+    
+    def last_frame(self):
+        # Son tamamlanan karenin toplamı ve alt sistem süreleri (ms)
+        last = (self.index - 1) % self.history
+        row = self.times[last]
+        sections = {name: round(float(row[column]) * 1000, 3)
+                    for column, name in enumerate(self.names) if row[column] > 0}
+        return float(self.totals[last]) * 1000, sections
+    
+    def section(self, name):
+        # Alt sistem süresi: çubuklarda bir sütun, izde bir aralık
+        if not self.enabled and self.tracer is None:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            if len(self.names) >= self.MAX_SECTIONS:
+                return NULL_SECTION
+            section = ProfileSection(self, name, len(self.names))
+            self.sections[name] = section
+            self.names.append(name)
+            self.colors.append(self.section_color(section.column))
+        return section
+    
+    def span(self, name):
+        # Alt bölümleri kapsayan aralık; sadece iz kaydına girer
+        if self.tracer is None:
+            return NULL_SECTION
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = ProfileSection(self, name, -1)
+        return span
+    
+    def start_trace(self):
+        self.tracer = TraceRecorder()
+    
+    def stop_trace(self, path=None):
+        tracer = self.tracer
+        self.tracer = None
+        if path is None:
+            path = datetime.datetime.now().strftime("matrix_trace_%Y%m%d_%H%M%S.json")
+        return tracer.dump(path)
+    
+    def begin_frame(self):
+        # İzdeki kare aralığı bir sonraki kare başında kapanır; clock.tick beklemesi de içinde kalır
+        now = time.perf_counter()
+        if self.tracer is not None and self.frame_start >= self.tracer.origin:
+            self.tracer.span('frame', self.frame_start, now)
+        self.frame_start = now
+        if not self.enabled:
+            return
+        self.row = self.times[self.index]
+        self.row[:] = 0
+    
+    def end_frame(self, counts=None):
+        if not self.enabled:
+            return
+        self.totals[self.index] = time.perf_counter() - self.frame_start
+        if counts is not None:
+            self.counts = counts
+        self.index = (self.index + 1) % self.history
+        self.filled = min(self.filled + 1, self.history)
+        self.frames += 1
+    
+    def ordered(self):
+        # Halka tamponunu eskiden yeniye sırala (ms)
+        times = np.roll(self.times, -self.index, axis=0)[-self.filled:] * 1000
+        totals = np.roll(self.totals, -self.index)[-self.filled:] * 1000
+        return times, totals
+    
+    def section_color(self, column):
+        color = pygame.Color(0)
+        color.hsva = ((column * 47) % 360, 70, 100, 100)
+        return color[:3]
+    
+    def rect(self):
+        rows = len(self.names) + len(self.counts) + 3
+        return pygame.Rect(WIDTH - self.PANEL_WIDTH - 10, 140,
+                           self.PANEL_WIDTH, self.GRAPH_HEIGHT + 20 + rows * 14)
+    
+    def push_graph(self):
+        # Grafik her kare 2 piksel kayar, sadece son karenin sütunu çizilir
+        width = self.GRAPH_FRAMES * 2
+        height = self.GRAPH_HEIGHT
+        if self.graph_surface is None:
+            self.graph_surface = pygame.Surface((width, height))
+            self.graph_surface.fill((10, 10, 10))
+        graph = self.graph_surface
+        graph.scroll(-2, 0)
+        graph.fill((10, 10, 10), (width - 2, 0, 2, height))
+        
+        last = (self.index - 1) % self.history
+        row = self.times[last] * 1000
+        scale = height / (self.BUDGET_MS * 2)
+        segments = [(self.colors[column], row[column]) for column in range(len(self.names))]
+        segments.append((COLORS['matrix_gray'], max(0.0, self.totals[last] * 1000 - row.sum())))
+        
+        top = float(height)
+        for color, ms in segments:
+            bottom = top
+            top = max(0.0, top - ms * scale)
+            if int(bottom) > int(top):
+                graph.fill(color, (width - 2, int(top), 2, int(bottom) - int(top)))
+        graph.fill(COLORS['matrix_red'], (width - 2, height - int(self.BUDGET_MS * scale), 2, 1))
+    
+    def build_text(self, times, totals):
+        # Metin her kare değil, birkaç karede bir yenilenir
+        count = len(self.names)
+        self.p95[:count] = np.percentile(times[:, :count], 95, axis=0)
+        total_p95 = float(np.percentile(totals, 95))
+        last = times[-1]
+        
+        rect = self.rect()
+        surface = pygame.Surface((rect.width, rect.height - self.GRAPH_HEIGHT - 20))
+        surface.fill((0, 15, 0))
+        header = small_font.render(
+            f"FRAME {totals[-1]:6.2f} ms   p95 {total_p95:6.2f} ms   budget {self.BUDGET_MS:.1f}",
+            True, COLORS['matrix_white'])
+        surface.blit(header, (0, 0))
+        
+        y = 16
+        for column, name in enumerate(self.names):
+            pygame.draw.rect(surface, self.colors[column], (0, y + 2, 8, 8))
+            text = small_font.render(f"{name:<16} {last[column]:6.2f}  p95 {self.p95[column]:6.2f}",
+                                     True, COLORS['matrix_light_green'])
+            surface.blit(text, (14, y))
+            y += 14
+        
+        y += 6
+        for name, value in self.counts.items():
+            text = small_font.render(f"{name:<16} {value}", True, COLORS['matrix_cyan'])
+            surface.blit(text, (14, y))
+            y += 14
+        self.text_surface = surface
+    
+    def draw(self, surface):
+        if not self.visible or self.filled == 0:
+            return None
+        
+        self.push_graph()
+        self.text_timer -= 1
+        if self.text_surface is None or self.text_timer <= 0:
+            self.build_text(*self.ordered())
+            self.text_timer = 15
+        
+        rect = self.rect()
+        pygame.draw.rect(surface, (0, 15, 0), rect)
+        pygame.draw.rect(surface, COLORS['matrix_green'], rect, 1)
+        surface.blit(self.graph_surface, (rect.x + 10, rect.y + 10))
+        surface.blit(self.text_surface, (rect.x + 10, rect.y + self.GRAPH_HEIGHT + 20))
+        return rect
+
+class HitchDetector:
+    # Bütçeyi aşan kareleri bağlamıyla birlikte dönen bir günlüğe yazar
+    def __init__(self, budget_ms=HITCH_BUDGET_MS, path="matrix_hitches.log",
+                 max_bytes=1 << 20, backups=3, frames=60, warmup=30):
+        self.budget_ms = budget_ms
+        self.frames = frames
+        self.warmup = warmup
+        self.count = 0
+        self.handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, delay=True)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        # Tek günlükçü; kapatılmadan bırakılmış önceki bekçinin işleyicisi sökülür ki
+        # olaylar iki kez yazılmasın
+        self.logger = logging.getLogger("matrix.hitches")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+            handler.close()
+        self.logger.addHandler(self.handler)
+    
+    def check(self, gm):
+        # Açıldıktan sonraki ilk kareler (önbellek dolumu) sayılmaz
+        if self.warmup > 0:
+            self.warmup -= 1
+            return None
+        total_ms, sections = gm.profiler.last_frame()
+        if total_ms <= self.budget_ms:
+            return None
+        
+        self.count += 1
+        snapshot = self.snapshot(gm, total_ms, sections)
+        self.logger.info(json.dumps(snapshot))
+        return snapshot
+    
+    def snapshot(self, gm, total_ms, sections):
+        profiler = gm.profiler
+        boss = gm.boss
+        weather = gm.weather_system
+        return {
+            'time': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'frame': profiler.frames,
+            'frame_ms': round(total_ms, 3),
+            'budget_ms': round(self.budget_ms, 3),
+            'state': gm.state.name,
+            'wave': gm.wave,
+            'game_time': gm.game_time,
+            'counts': gm.profiler_counts(),
+            'weather': {'type': weather.current_weather.value,
+                        'intensity': weather.weather_intensity,
+                        'timer': weather.weather_timer},
+            'boss': None if boss is None else {
+                'phase': boss.phase, 'pattern': boss.pattern,
+                'health': boss.health, 'invulnerable': boss.invulnerable},
+            'powerups': {name: timer for name, timer in gm.player.powerups.items() if timer > 0},
+            'cutscene': gm.cutscene_manager.active_cutscene,
+            'gc_pauses': gm.gc_manager.frame_pauses if gm.gc_manager else None,
+            'sections_ms': sections,
+            'last_frames_ms': np.round(profiler.ordered()[1][-self.frames:], 3).tolist(),
+        }
+    
+    def close(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+NULL_SECTION = contextlib.nullcontext()
+
+# ==================== MEMORY MONITOR ====================
+# Tahsis başına saklanan çerçeve; kütüphane içinden çağıran oyun satırına ulaşacak kadar
+MEMORY_TRACE_FRAMES = 10
+
+def rss_kb():
+    # Anlık RSS (Linux); yoksa en yüksek RSS'e düşülür
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+class MemoryMonitor:
+    # Her dalga başında (ve uzun dalgalarda belirli aralıklarla) canlı sayıları örnekler
+    def __init__(self, tracemalloc_frames=0, top=10, interval=TICK_RATE * 60,
+                 window=4, min_growth=32):
+        self.top = top
+        self.interval = interval
+        self.window = window
+        self.min_growth = min_growth
+        self.samples = []
+        self.warnings = []
+        self.last_wave = None
+        self.next_sample = 0
+        self.logger = logging.getLogger("matrix.memory")
+        self.tracing = tracemalloc_frames > 0 and not tracemalloc.is_tracing()
+        if self.tracing:
+            tracemalloc.start(tracemalloc_frames)
+    
+    def containers(self, gm):
+        pool = bullet_pool
+        n = pool.count
+        faction = pool.faction[:n]
+        stationary = (pool.dx[:n] == 0) & (pool.dy[:n] == 0)
+        return {
+            'enemies': len(gm.enemies),
+            'minions': len(gm.boss.minions) if gm.boss else 0,
+            'powerups': len(gm.powerups),
+            'bullets.player': int((faction == BulletPool.PLAYER).sum()),
+            'bullets.enemy': int((faction == BulletPool.ENEMY).sum()),
+            'bullets.boss': int((faction == BulletPool.BOSS).sum()),
+            'bullets.stationary': int(stationary.sum()),
+            'bullet_pool.capacity': len(pool.x),
+            'particles': gm.particle_system.count,
+            'particles.capacity': len(gm.particle_system.x),
+            'weather.particles': len(gm.weather_system.particles),
+            'weather.effects': len(gm.weather_system.effects),
+            'player.trail_particles': len(gm.player.trail_particles),
+            'time.effects': len(gm.time_manipulation.effects),
+            'assistant.messages': len(gm.ai_assistant.messages),
+            'world.entities': gm.world.next_index - len(gm.world.free_indices),
+            'surface_pool': len(surface_pool.surfaces),
+            'glyph_atlas.tints': len(glyph_atlas.tints),
+            'enemy_sprites': len(enemy_sprites.bodies) + len(enemy_sprites.shields),
+        }
+    
+    def update(self, gm):
+        # Dalga değişiminde veya aralık dolunca örnek al
+        if gm.wave != self.last_wave:
+            self.last_wave = gm.wave
+            return self.sample(gm, 'wave')
+        if gm.game_time >= self.next_sample:
+            return self.sample(gm, 'interval')
+        return None
+    
+    def sample(self, gm, reason):
+        self.next_sample = gm.game_time + self.interval
+        sample = {
+            'reason': reason,
+            'wave': gm.wave,
+            'game_time': gm.game_time,
+            'rss_kb': rss_kb(),
+            'gc_objects': len(gc.get_objects()),
+            'counts': self.containers(gm),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            sample['traced_kb'] = current // 1024
+            sample['traced_peak_kb'] = peak // 1024
+            sample['top'] = self.top_allocations()
+        self.samples.append(sample)
+        self.check_growth()
+        return sample
+    
+    def top_allocations(self):
+        # Yığınlar en içteki oyun satırına göre toplanır; numpy/pygame içindeki
+        # tahsisler onları çağıran oyun satırına yazılır
+        stats = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )).statistics('traceback')
+        sites = {}
+        for stat in stats:
+            frame = next((frame for frame in reversed(stat.traceback) if frame.filename == __file__),
+                         stat.traceback[-1])
+            where = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            site = sites.setdefault(where, {'where': where, 'size_kb': 0.0, 'count': 0})
+            site['size_kb'] += stat.size / 1024
+            site['count'] += stat.count
+        top = sorted(sites.values(), key=lambda site: site['size_kb'], reverse=True)[:self.top]
+        for site in top:
+            site['size_kb'] = round(site['size_kb'], 1)
+        return top
+    
+    def check_growth(self):
+        # Son `window` dalga örneğinde hiç düşmeden büyüyen kapsayıcılar uyarılır
+        waves = [sample for sample in self.samples if sample['reason'] == 'wave']
+        if len(waves) < self.window:
+            return
+        recent = waves[-self.window:]
+        for name in recent[-1]['counts']:
+            values = [sample['counts'][name] for sample in recent]
+            growing = all(b >= a for a, b in zip(values, values[1:]))
+            if growing and values[-1] - values[0] >= self.min_growth:
+                message = (f"{name} grew for {self.window} waves: "
+                           f"{values[0]} -> {values[-1]} (wave {recent[-1]['wave']})")
+                self.warnings.append(message)
+                self.logger.warning(message)
+    
+    def report(self):
+        return {
+            'samples': self.samples,
+            'warnings': self.warnings,
+            'rss_kb': rss_kb(),
+        }
+    
+    def close(self):
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+# ==================== GC MANAGEMENT ====================
+class GCManager:
+    # Oyun sırasında otomatik toplama ertelenir; kare sonunda bir sonraki kareye ya da
+    # simülasyon tikine kalan süre, o neslin ölçülen duraklamasına yetiyorsa elle yapılır
+    def __init__(self, budget_ms=1000.0 / MAX_RENDER_FPS, hard_factor=20, full_ratio=0.25,
+                 hard_full_ratio=1.0, min_heap=20000, history=256):
+        self.budget_ms = budget_ms
+        self.hard_factor = hard_factor
+        # Nesil başına duraklama tahmini (ms); ölçülen en kötü değer yavaşça söner
+        self.cost_ms = [0.2, 0.5, 2.0]
+        # Tam toplama son tam toplamadan beri 2. nesil bu oranda büyüyünce (CPython kuralı)
+        # boş sürede, hard_full_ratio kadar büyüyünce beklemeden yapılır
+        self.full_ratio = full_ratio
+        self.hard_full_ratio = hard_full_ratio
+        self.min_heap = min_heap
+        self.long_lived = None
+        self.heap = 0
+        self.heap_count = None
+        self.deferring = False
+        self.reason = 'auto'
+        self.started = 0.0
+        self.profiler = None
+        self.pauses = deque(maxlen=history)
+        self.frame_pauses = []
+        self.stats = {generation: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+                      for generation in range(3)}
+        self.reasons = {}
+    
+    def install(self, profiler=None):
+        self.profiler = profiler
+        if self.on_gc not in gc.callbacks:
+            gc.callbacks.append(self.on_gc)
+    
+    def uninstall(self):
+        if self.on_gc in gc.callbacks:
+            gc.callbacks.remove(self.on_gc)
+        gc.enable()
+        gc.unfreeze()
+        self.deferring = False
+    
+    def freeze(self):
+        # Başlangıç nesneleri kalıcı nesle taşınır, sonraki taramalar onları gezmez
+        self.collect(2, 'startup')
+        gc.freeze()
+    
+    def on_gc(self, phase, info):
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+        end = time.perf_counter()
+        ms = (end - self.started) * 1000
+        generation = info['generation']
+        stats = self.stats[generation]
+        stats['count'] += 1
+        stats['total_ms'] += ms
+        stats['max_ms'] = max(stats['max_ms'], ms)
+        if self.reason != 'startup':
+            # Dondurma öncesi tarama sonrakileri temsil etmez
+            self.cost_ms[generation] = max(ms, self.cost_ms[generation] * 0.9)
+        if generation == 2:
+            self.long_lived = None
+        self.reasons[self.reason] = self.reasons.get(self.reason, 0) + 1
+        pause = (generation, round(ms, 3), self.reason)
+        self.pauses.append(pause)
+        self.frame_pauses.append(pause)
+        
+        tracer = self.profiler.tracer if self.profiler else None
+        if tracer is not None:
+            tracer.span(f"gc.gen{generation}.{self.reason}", self.started, end)
+    
+    def collect(self, generation, reason):
+        self.reason = reason
+        try:
+            gc.collect(generation)
+        finally:
+            self.reason = 'auto'
+    
+    def frame(self, gm, elapsed_ms, next_tick_ms=0.0):
+        # Kare bitiminde çağrılır; bundan sonraki duraklamalar bir sonraki kareye yazılır.
+        # next_tick_ms: sıradaki simülasyon tikine kalan süre; o ana kadar yalnızca ara kareler kaybolur
+        self.schedule(gm, max(self.budget_ms - elapsed_ms, next_tick_ms))
+        self.frame_pauses = []
+    
+    def heap_growth(self, count2):
+        # 2. nesil yalnızca 1. nesil toplamalarıyla büyür; boyut o zaman yeniden sayılır
+        if self.long_lived is None:
+            self.long_lived = self.heap = len(gc.get_objects(2))
+            self.heap_count = count2
+        elif count2 != self.heap_count:
+            self.heap = len(gc.get_objects(2))
+            self.heap_count = count2
+        return (self.heap - self.long_lived) / max(self.long_lived, self.min_heap)
+    
+    def schedule(self, gm, slack):
+        # Kalan süreye ve yığın büyümesine göre hangi neslin toplanacağı seçilir
+        gameplay = gm.state == GameState.PLAYING and not gm.cutscene_manager.active_cutscene
+        if gameplay != self.deferring:
+            self.deferring = gameplay
+            if gameplay:
+                gc.disable()
+            else:
+                # Menü, duraklatma ve ara sahnelerde tam toplama fark edilmez
+                gc.enable()
+                self.collect(2, 'idle')
+        if not gameplay:
+            return
+        
+        count0, count1, count2 = gc.get_count()
+        threshold0, threshold1, threshold2 = gc.get_threshold()
+        growth = self.heap_growth(count2)
+        if growth >= self.hard_full_ratio:
+            # Yığın menüye kadar sınırsız büyümesin
+            self.collect(2, 'forced')
+            return
+        if count2 >= threshold2 and growth >= self.full_ratio and slack >= self.cost_ms[2]:
+            self.collect(2, 'slack')
+            return
+        generation = 1 if count1 >= threshold1 else 0
+        if count0 >= threshold0 * self.hard_factor:
+            # Bellek sınırsız büyümesin: boş süre olmasa da genç nesil toplanır
+            self.collect(generation, 'forced')
+        elif count0 >= threshold0 and slack >= self.cost_ms[generation]:
+            self.collect(generation, 'slack')
+    
+    def report(self):
+        return {
+            'generations': {generation: {'count': stats['count'],
+                                         'total_ms': round(stats['total_ms'], 3),
+                                         'max_ms': round(stats['max_ms'], 3)}
+                            for generation, stats in self.stats.items()},
+            'reasons': dict(self.reasons),
+            'frozen': gc.get_freeze_count(),
+            'recent': list(self.pauses)[-20:],
+        }
+
 # ==================== MAIN GAME MANAGER ====================
 class GameManager:
-    def __init__(self):
+    # Anahtar karelere giren simülasyon durumu; çizim, ölçüm, görsel efektler ve
+    # her sorgudan önce yeniden kurulan ızgaralar dışarıda kalır
+    SNAPSHOT_FIELDS = (
+        'state', 'player', 'players', 'upgrade_system', 'mission_system', 'weather_system',
+        'time_manipulation', 'ai_assistant', 'statistics', 'cutscene_manager', 'world', 'boss',
+        'enemy_spawn_timer', 'wave', 'enemies_per_wave', 'enemies_spawned', 'wave_timer',
+        'game_time', 'screen_shake', 'weather_change_timer', 'multiplayer', 'tick_count'
+    )
+    
+    def __init__(self, headless=HEADLESS):
+        self.headless = headless
         self.state = GameState.MAIN_MENU
         self.player = Player()
         self.matrix_rain = MatrixRain(1.0)
@@ -1963,9 +3740,21 @@ class GameManager:
         self.particle_system = ParticleSystem()
         
         # Oyun verileri
-        self.enemies = []
-        self.powerups = []
+        self.world = World()
+        register_enemy_components(self.world)
+        self.world.register('powerup')
+        self.world.register('boss')
+        self.profiler = FrameProfiler()
+        self.world.profiler = self.profiler
+        self.trace_state = None
+        self.hitch_detector = None
+        self.memory_monitor = None
+        self.gc_manager = None
+        self.recorder = None
+        self.tick_count = 0
         self.boss = None
+        self.enemy_grid = SpatialHash(64)
+        self.powerup_grid = SpatialHash(64)
         self.enemy_spawn_timer = 0
         self.wave = 1
         self.enemies_per_wave = 8
@@ -1974,12 +3763,27 @@ class GameManager:
         self.game_time = 0
         self.screen_shake = 0
         
+        # Sistemler tik başına bu sırayla bir kez çalışır
+        self.world.add_system("bullets", self.bullet_system)
+        self.world.add_system("progression", self.progression_system)
+        self.world.add_system("enemy_ai", self.enemy_ai_system)
+        self.world.add_system("enemy_bounds", self.enemy_bounds_system)
+        self.world.add_system("minions", self.minion_system)
+        self.world.add_system("powerups", self.powerup_system)
+        self.world.add_system("collisions", self.collision_system)
+        
+        # Çizim
+        self.interpolator = Interpolator()
+        self.frame_surface = None
+        self.dirty_rect_mode = False
+        self.dirty_rects = DirtyRectTracker()
+        
         # Multiplayer (temel)
         self.multiplayer = False
         self.players = [self.player]
         
         # Hava durumu değişimi
-        self.weather_change_timer = random.randint(600, 1800)
+        self.weather_change_timer = rng_service.sim.randint(600, 1800)
         
         # Seviye editörü
         self.editor_mode = False
@@ -1989,6 +3793,17 @@ class GameManager:
         self.high_scores = []
         self.load_high_scores()
     
+    @property
+    def enemies(self):
+        return self.world.objects(ENEMY, 'enemy')
+    
+    @property
+    def powerups(self):
+        return self.world.objects(('powerup',), 'powerup')
+    
+    def spawn_powerup(self, powerup):
+        self.world.spawn(('powerup',), powerup=powerup)
+    
     def load_high_scores(self):
         try:
             with open('matrix_highscores.json', 'r') as f:
@@ -2024,9 +3839,9 @@ class GameManager:
         
         # Oyunu sıfırla
         self.player = Player()
-        self.enemies = []
-        self.powerups = []
+        self.world.clear()
         self.boss = None
+        bullet_pool.clear()
         self.wave = 1
         self.enemies_spawned = 0
         self.game_time = 0
@@ -2037,19 +3852,83 @@ class GameManager:
         
         # İlk hava durumu
         self.weather_system.set_weather(
-            random.choice([WeatherType.DATA_RAIN, WeatherType.CLEAR]),
-            random.uniform(0.5, 1.0),
-            random.randint(600, 1200)
+            rng_service.sim.choice([WeatherType.DATA_RAIN, WeatherType.CLEAR]),
+            rng_service.sim.uniform(0.5, 1.0),
+            rng_service.sim.randint(600, 1200)
         )
     
+    def tick(self, keys):
+        # Bir sabit simülasyon adımı; ara değer için önceki konumlar saklanır (başsızda çizim yok)
+        if self.recorder is not None:
+            self.recorder.tick(self, keys)
+        with self.profiler.span('update'):
+            if not self.headless:
+                self.interpolator.capture(self)
+            self.update(keys)
+        self.tick_count += 1
+        if self.profiler.tracer is not None:
+            self.trace_changes()
+        if self.memory_monitor is not None:
+            self.memory_monitor.update(self)
+    
+    def save_state(self):
+        # Tüm simülasyon durumu tek pickle'da: nesneler arası paylaşılan referanslar korunur
+        state = {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS}
+        return pickle.dumps((state, (WIDTH, HEIGHT), bullet_pool.getstate(), rng_service.getstate()),
+                            pickle.HIGHEST_PROTOCOL)
+    
+    def load_state(self, data):
+        state, resolution, bullets, rng = KeyframeUnpickler(io.BytesIO(data)).load()
+        systems, profiler = self.world.systems, self.world.profiler
+        self.__dict__.update(state)
+        self.world.systems = systems
+        self.world.profiler = profiler
+        bullet_pool.setstate(bullets)
+        rng_service.setstate(rng)
+        if resolution != (WIDTH, HEIGHT):
+            set_resolution(*resolution, self.headless)
+            self.matrix_rain.setup_columns()
+        if not self.headless:
+            self.interpolator.capture(self)
+        self.dirty_rects.invalidate()
+    
+    def trace_changes(self):
+        # Dalga, boss fazı ve hava değişimleri izde anlık olay olarak görünür
+        tracer = self.profiler.tracer
+        state = (self.wave,
+                 self.boss.phase if self.boss else None,
+                 self.weather_system.current_weather)
+        last = self.trace_state
+        self.trace_state = state
+        if last is None:
+            return
+        wave, phase, weather = state
+        if wave != last[0]:
+            tracer.instant(f"wave {wave}", wave=wave)
+        if phase != last[1]:
+            if phase is None:
+                tracer.instant("boss defeated", wave=wave)
+            else:
+                tracer.instant(f"boss phase {phase}", phase=phase, health=self.boss.health)
+        if weather != last[2]:
+            tracer.instant(f"weather {weather.value}", weather=weather.value,
+                           intensity=self.weather_system.weather_intensity)
+    
     def update(self, keys):
+        # Zaman ölçeği (yavaş çekim) yalnızca oyuncuya, oyuncu mermilerine, yağmura ve düşman
+        # doğma sayacına uygulanır; düşman AI, düşman/boss mermileri, boss, hava ve parçacıklar
+        # tam hızda kalır. Bu oynanışın kendisidir, sabit adım düzeni bunu değiştirmez; dünyayı
+        # yavaşlatmak tamsayı tik sayaçlarının (AI, boss saldırısı) kesirli ilerlemesini gerektirir
         time_scale = self.time_manipulation.get_time_scale()
         
+        profiler = self.profiler
+        
         # Cutscene kontrolü
         if self.cutscene_manager.active_cutscene:
-            if self.cutscene_manager.update():
-                if self.cutscene_manager.active_cutscene == "game_over":
-                    self.state = GameState.GAME_OVER
+            with profiler.section('cutscene'):
+                if self.cutscene_manager.update():
+                    if self.cutscene_manager.active_cutscene == "game_over":
+                        self.state = GameState.GAME_OVER
             return
         
         # Oyun durumuna göre güncelle
@@ -2057,11 +3936,14 @@ class GameManager:
             self.game_time += 1
             
             # Sistemleri güncelle
-            self.matrix_rain.update(time_scale)
-            self.weather_system.update()
+            with profiler.section('matrix_rain'):
+                self.matrix_rain.update(time_scale)
+            with profiler.section('weather'):
+                self.weather_system.update()
             self.time_manipulation.update()
             self.ai_assistant.update()
-            self.particle_system.update()
+            with profiler.section('particles'):
+                self.particle_system.update()
             
             # Ekran titremesi
             screen_shake = self.weather_system.get_screen_shake()
@@ -2070,47 +3952,42 @@ class GameManager:
             self.screen_shake = screen_shake * 0.9
             
             # Oyuncuyu güncelle
-            self.player.update(keys, time_scale)
+            with profiler.section('player'):
+                self.player.update(keys, time_scale)
             
             # Hava durumu değişimi
             self.weather_change_timer -= 1
             if self.weather_change_timer <= 0:
-                new_weather = random.choice(list(WeatherType))
+                new_weather = rng_service.sim.choice(list(WeatherType))
                 self.weather_system.set_weather(
                     new_weather,
-                    random.uniform(0.5, 1.5),
-                    random.randint(300, 900)
+                    rng_service.sim.uniform(0.5, 1.5),
+                    rng_service.sim.randint(300, 900)
                 )
-                self.weather_change_timer = random.randint(600, 1800)
+                self.weather_change_timer = rng_service.sim.randint(600, 1800)
             
-            # Boss kontrolü
-            if self.boss:
-                self.update_boss(time_scale)
-            else:
-                # Normal dalga
-                self.update_wave(time_scale)
-            
-            # Çarpışma tespiti
-            self.check_collisions()
+            # Mermiler, dalga/boss, düşmanlar, powerup'lar ve çarpışmalar
+            self.world.run_systems(time_scale)
             
             # Görev ilerlemesi
-            game_data = {
-                'enemies_killed': self.player.stats['enemies_killed'],
-                'powerups_collected': self.player.stats['powerups_collected'],
-                'waves_completed': self.wave - 1,
-                'shots_fired': self.player.stats['shots_fired'],
-                'shots_hit': self.player.stats['shots_hit'],
-                'accuracy': self.player.stats['shots_hit'] / max(1, self.player.stats['shots_fired']),
-                'combo': self.player.combo,
-                'player_health': self.player.health,
-                'enemies': len(self.enemies),
-                'boss_active': self.boss is not None
-            }
-            self.mission_system.update_progress(game_data)
-            
-            # AI Assistant ipuçları
-            if random.random() < 0.001:  # 0.1% chance per frame
-                self.ai_assistant.give_situational_tip(game_data)
+            with profiler.section('missions'):
+                game_data = {
+                    'enemies_killed': self.player.stats['enemies_killed'],
+                    'powerups_collected': self.player.stats['powerups_collected'],
+                    'waves_completed': self.wave - 1,
+                    'shots_fired': self.player.stats['shots_fired'],
+                    'shots_hit': self.player.stats['shots_hit'],
+                    'accuracy': self.player.stats['shots_hit'] / max(1, self.player.stats['shots_fired']),
+                    'combo': self.player.combo,
+                    'player_health': self.player.health,
+                    'enemies': len(self.enemies),
+                    'boss_active': self.boss is not None
+                }
+                self.mission_system.update_progress(game_data)
+                
+                # AI Assistant ipuçları
+                if rng_service.fx.random() < 0.001:  # 0.1% chance per frame
+                    self.ai_assistant.give_situational_tip(game_data)
             
             # Oyun bitti mi?
             if self.player.health <= 0:
@@ -2120,6 +3997,76 @@ class GameManager:
             # Duraklatılmış durumda sadece parçacıklar
             self.particle_system.update()
     
+    def bullet_system(self, time_scale):
+        bullet_pool.update(time_scale)
+    
+    def progression_system(self, time_scale):
+        # Boss kontrolü
+        if self.boss:
+            self.update_boss(time_scale)
+        else:
+            # Normal dalga
+            self.update_wave(time_scale)
+    
+    def enemy_ai_system(self, time_scale):
+        player_x = self.player.x + self.player.width//2
+        player_y = self.player.y + self.player.height//2
+        for arch in self.world.query('kinematics', 'ai', 'enemy'):
+            update_enemy_ai(arch, player_x, player_y)
+    
+    def enemy_bounds_system(self, time_scale):
+        # Ekran dışına çıkma kontrolü (yalnızca dalga düşmanları)
+        for arch in self.world.query(*ENEMY, exclude=('minion',)):
+            escaped = np.flatnonzero(arch.view()['y'] > HEIGHT + 50).tolist()
+            for enemy in [arch.lists['enemy'][i] for i in escaped]:
+                self.world.despawn(enemy.entity)
+                self.player.take_damage(5 * enemy.level)
+    
+    def minion_system(self, time_scale):
+        if not self.boss:
+            return
+        
+        for minion in self.boss.minions[:]:
+            if minion.health <= 0:
+                self.world.despawn(minion.entity)
+                continue
+            
+            # Minion çarpışması
+            if (self.player.x < minion.x + minion.size and
+                self.player.x + self.player.width > minion.x and
+                self.player.y < minion.y + minion.size and
+                self.player.y + self.player.height > minion.y):
+                
+                if self.player.take_damage(minion.level * 8):
+                    self.end_game()
+                    return
+    
+    def powerup_system(self, time_scale):
+        # Boss savaşında powerup'lar beklemede kalır
+        if self.boss:
+            return
+        
+        for powerup in self.powerups[:]:
+            if not powerup.update():
+                self.world.despawn(powerup.entity)
+        
+        # Otomatik toplama
+        if self.player.auto_collect_range > 0:
+            self.build_powerup_grid()
+            for powerup, _ in self.powerup_grid.query_radius(
+                    self.player.x + self.player.width//2,
+                    self.player.y + self.player.height//2,
+                    self.player.auto_collect_range):
+                self.collect_powerup(powerup)
+                self.world.despawn(powerup.entity)
+    
+    def collision_system(self, time_scale):
+        # Sahibi ölen mermiler
+        bullet_pool.cull_orphans(self.world)
+        
+        # Çarpışma tespiti
+        self.check_collisions()
+    
     def update_wave(self, time_scale):
         # Düşman spawn etme
         self.enemy_spawn_timer -= time_scale
@@ -2139,11 +4086,10 @@ class GameManager:
             if self.wave >= 6:
                 enemy_types.append(EnemyType.TROJAN)
             
-            enemy_type = random.choice(enemy_types)
+            enemy_type = rng_service.sim.choice(enemy_types)
             level = min(5, 1 + (self.wave - 1) // 2)
             
-            enemy = Enemy(enemy_type, level)
-            self.enemies.append(enemy)
+            spawn_enemy(self.world, Enemy(enemy_type, level))
             self.enemies_spawned += 1
             self.enemy_spawn_timer = max(10, 60 - self.wave * 3)
         
@@ -2163,10 +4109,10 @@ class GameManager:
                 self.player.add_score(1000 * self.wave)
                 
                 # Rastgele powerup düşür
-                if random.random() < 0.5:
-                    self.powerups.append(PowerUp(
-                        random.randint(100, WIDTH-100),
-                        random.randint(50, 200)
+                if rng_service.sim.random() < 0.5:
+                    self.spawn_powerup(PowerUp(
+                        rng_service.sim.randint(100, WIDTH-100),
+                        rng_service.sim.randint(50, 200)
                     ))
             
             # Görev ilerlemesi
@@ -2175,32 +4121,18 @@ class GameManager:
             # İstatistik güncelleme
             if self.wave > self.statistics.stats['highest_wave']:
                 self.statistics.stats['highest_wave'] = self.wave
-        
-        # Düşmanları güncelle
-        for enemy in self.enemies[:]:
-            enemy.update(self.player.x + self.player.width//2, 
-                        self.player.y + self.player.height//2)
-            
-            # Ekran dışına çıkma kontrolü
-            if enemy.y > HEIGHT + 50:
-                self.enemies.remove(enemy)
-                self.player.take_damage(5 * enemy.level)
-        
-        # Powerup'ları güncelle
-        for powerup in self.powerups[:]:
-            if not powerup.update():
-                self.powerups.remove(powerup)
-                continue
-            
-            # Otomatik toplama
-            if self.player.auto_collect_range > 0:
-                distance = math.sqrt(
-                    (powerup.x - (self.player.x + self.player.width//2))**2 +
-                    (powerup.y - (self.player.y + self.player.height//2))**2
-                )
-                if distance < self.player.auto_collect_range:
-                    self.collect_powerup(powerup)
-                    self.powerups.remove(powerup)
+    
+    def build_enemy_grid(self):
+        grid = self.enemy_grid
+        grid.clear()
+        for enemy in self.enemies:
+            grid.insert(enemy, enemy.x, enemy.y, enemy.size, enemy.size)
+    
+    def build_powerup_grid(self):
+        grid = self.powerup_grid
+        grid.clear()
+        for powerup in self.powerups:
+            grid.insert(powerup, powerup.x, powerup.y)
     
     def update_boss(self, time_scale):
         if not self.boss:
@@ -2226,11 +4158,15 @@ class GameManager:
             
             # Powerup yağmuru
             for _ in range(5):
-                self.powerups.append(PowerUp(
-                    self.boss.x + random.randint(-50, 50),
-                    self.boss.y + random.randint(-50, 50)
+                self.spawn_powerup(PowerUp(
+                    self.boss.x + rng_service.sim.randint(-50, 50),
+                    self.boss.y + rng_service.sim.randint(-50, 50)
                 ))
             
+            # Boss ve minionları dünyadan çıkar
+            for minion in self.boss.minions[:]:
+                self.world.despawn(minion.entity)
+            self.world.despawn(self.boss.entity)
             self.boss = None
             self.wave += 1
             self.enemies_spawned = 0
@@ -2242,159 +4178,178 @@ class GameManager:
             return
         
         # Boss mermileri ile çarpışma
-        for bullet in self.boss.bullets[:]:
-            if (bullet['x'] > self.player.x and
-                bullet['x'] < self.player.x + self.player.width and
-                bullet['y'] > self.player.y and
-                bullet['y'] < self.player.y + self.player.height):
-                
-                damage = 20 if bullet.get('laser') else 10
-                if self.player.take_damage(damage):
-                    self.end_game()
-                    return
-                
-                # Patlama efekti
-                self.particle_system.add_explosion(bullet['x'], bullet['y'], bullet['color'])
-                if not bullet.get('shield') and not bullet.get('time_slow'):
-                    self.boss.bullets.remove(bullet)
-        
-        # Boss minionları
-        for minion in self.boss.minions[:]:
-            minion.update(self.player.x + self.player.width//2,
-                         self.player.y + self.player.height//2)
-            
-            # Minion çarpışması
-            if (self.player.x < minion.x + minion.size and
-                self.player.x + self.player.width > minion.x and
-                self.player.y < minion.y + minion.size and
-                self.player.y + self.player.height > minion.y):
-                
-                if self.player.take_damage(minion.level * 8):
-                    self.end_game()
-                    return
+        pool = bullet_pool
+        hits = []
+        for i in self.bullets_hitting_player(BulletPool.BOSS):
+            if self.player.take_damage(int(pool.damage[i])):
+                bullet_pool.remove(hits)
+                self.end_game()
+                return
             
-            # Minion mermileri
-            for bullet in minion.bullets:
-                if (bullet['x'] > self.player.x and
-                    bullet['x'] < self.player.x + self.player.width and
-                    bullet['y'] > self.player.y and
-                    bullet['y'] < self.player.y + self.player.height):
-                    
-                    if self.player.take_damage(minion.level * 3):
-                        self.end_game()
-                        return
+            # Patlama efekti
+            self.particle_system.add_explosion(pool.x[i], pool.y[i], tuple(pool.color[i]))
+            if not pool.flags[i] & (BulletPool.SHIELD | BulletPool.TIME_SLOW):
+                hits.append(i)
+        bullet_pool.remove(hits)
+    
+    def bullets_hitting_player(self, faction):
+        pool = bullet_pool
+        n = pool.count
+        x = pool.x[:n]
+        y = pool.y[:n]
+        hit = ((pool.faction[:n] == faction) &
+               (x > self.player.x) & (x < self.player.x + self.player.width) &
+               (y > self.player.y) & (y < self.player.y + self.player.height))
+        return np.flatnonzero(hit).tolist()
     
     def spawn_boss(self):
-        self.boss = MatrixBoss(self.wave // 5)
+        self.boss = MatrixBoss(self.wave // 5, self.world)
+        self.world.spawn(('boss',), boss=self.boss)
         self.cutscene_manager.play_cutscene("boss_intro")
         
         # Tüm düşmanları temizle
-        self.enemies.clear()
+        for enemy in self.enemies[:]:
+            self.world.despawn(enemy.entity)
         self.enemies_spawned = self.wave * self.enemies_per_wave
     
     def check_collisions(self):
+        pool = bullet_pool
+        grid = self.enemy_grid
+        self.build_enemy_grid()
+        
         # Oyuncu mermileri ile düşmanlar
-        for bullet in self.player.bullets[:]:
+        bullets = pool.indices(BulletPool.PLAYER)
+        bullets_x = pool.x[bullets]
+        bullets_y = pool.y[bullets]
+        candidates = grid.query_points(bullets_x, bullets_y)
+        hit_bullets, hit_enemies = point_aabb_hits(
+            bullets_x, bullets_y,
+            np.array([enemy.x for enemy in candidates], dtype=np.float64),
+            np.array([enemy.y for enemy in candidates], dtype=np.float64),
+            np.array([enemy.size for enemy in candidates], dtype=np.float64)
+        )
+        # Her merminin vuruşları çift listesinde ardışık durur
+        bounds = np.searchsorted(hit_bullets, np.arange(len(bullets) + 1)).tolist()
+        hit_enemies = hit_enemies.tolist()
+        
+        spent = []
+        spawned = []
+        for k, i in enumerate(bullets.tolist()):
+            bullet_x = pool.x[i]
+            bullet_y = pool.y[i]
+            bullet_color = tuple(pool.color[i])
             bullet_hit = False
             
-            # Düşmanlar ile çarpışma
-            for enemy in self.enemies[:]:
-                if (bullet['x'] > enemy.x and
-                    bullet['x'] < enemy.x + enemy.size and
-                    bullet['y'] > enemy.y and
-                    bullet['y'] < enemy.y + enemy.size):
-                    
-                    # Hasar hesapla
-                    damage = bullet['damage']
-                    if random.random() < self.player.critical_chance:
-                        damage *= 2
-                    
-                    # Firewall kalkanı
-                    if enemy.type == EnemyType.FIREWALL and enemy.shield_health > 0:
-                        enemy.shield_health -= damage
-                        if enemy.shield_health <= 0:
-                            enemy.shield_health = 0
-                            self.particle_system.add_explosion(
-                                enemy.x + enemy.size//2,
-                                enemy.y + enemy.size//2,
-                                COLORS['matrix_cyan']
-                            )
-                    else:
-                        enemy.health -= damage
-                    
-                    # Vuruş istatistiği
-                    self.player.stats['shots_hit'] += 1
+            targets = [candidates[e] for e in hit_enemies[bounds[k]:bounds[k + 1]]]
+            # Önceki mermilerin böldüğü virüsler listenin sonunda yer alır
+            for source, virus in spawned:
+                if (source < k and
+                    bullet_x > virus.x and
+                    bullet_x < virus.x + virus.size and
+                    bullet_y > virus.y and
+                    bullet_y < virus.y + virus.size):
+                    targets.append(virus)
+            
+            # Düşmanlar ile çarpışma (hesaplanmış vuruş çiftleri)
+            for enemy in targets:
+                # Bu turda ölen düşmanlar atlanır
+                if enemy not in grid:
+                    continue
+                
+                # Hasar hesapla
+                damage = float(pool.damage[i])
+                if rng_service.sim.random() < self.player.critical_chance:
+                    damage *= 2
+                
+                # Firewall kalkanı
+                if enemy.type == EnemyType.FIREWALL and enemy.shield_health > 0:
+                    enemy.shield_health -= damage
+                    if enemy.shield_health <= 0:
+                        enemy.shield_health = 0
+                        self.particle_system.add_explosion(
+                            enemy.x + enemy.size//2,
+                            enemy.y + enemy.size//2,
+                            COLORS['matrix_cyan']
+                        )
+                else:
+                    enemy.health -= damage
+                
+                # Vuruş istatistiği
+                self.player.stats['shots_hit'] += 1
+                
+                # Kombo
+                self.player.add_combo()
+                
+                # Patlama efekti
+                self.particle_system.add_explosion(
+                    bullet_x, bullet_y, bullet_color
+                )
+                
+                # Düşman öldü mü?
+                if enemy.health <= 0:
+                    # Skor ekle
+                    score_added = self.player.add_score(enemy.value)
                     
-                    # Kombo
-                    self.player.add_combo()
+                    # İstatistik
+                    self.player.stats['enemies_killed'] += 1
                     
-                    # Patlama efekti
+                    # Büyük patlama
                     self.particle_system.add_explosion(
-                        bullet['x'], bullet['y'], bullet['color']
+                        enemy.x + enemy.size//2,
+                        enemy.y + enemy.size//2,
+                        enemy.color,
+                        30
                     )
                     
-                    # Düşman öldü mü?
-                    if enemy.health <= 0:
-                        # Skor ekle
-                        score_added = self.player.add_score(enemy.value)
-                        
-                        # İstatistik
-                        self.player.stats['enemies_killed'] += 1
-                        
-                        # Büyük patlama
-                        self.particle_system.add_explosion(
-                            enemy.x + enemy.size//2,
-                            enemy.y + enemy.size//2,
-                            enemy.color,
-                            30
-                        )
-                        
-                        # Matrix yağmuru efekti
-                        self.particle_system.add_matrix_rain(
+                    # Matrix yağmuru efekti
+                    self.particle_system.add_matrix_rain(
+                        enemy.x + enemy.size//2,
+                        enemy.y + enemy.size//2
+                    )
+                    
+                    # Powerup düşürme şansı
+                    if rng_service.sim.random() < 0.25:
+                        self.spawn_powerup(PowerUp(
                             enemy.x + enemy.size//2,
                             enemy.y + enemy.size//2
-                        )
-                        
-                        # Powerup düşürme şansı
-                        if random.random() < 0.25:
-                            self.powerups.append(PowerUp(
-                                enemy.x + enemy.size//2,
-                                enemy.y + enemy.size//2
-                            ))
-                        
-                        # Virüs split özelliği
-                        if enemy.type == EnemyType.VIRUS and enemy.level > 1:
-                            for _ in range(2):
-                                virus = Enemy(EnemyType.VIRUS, enemy.level - 1)
-                                virus.x = enemy.x + random.randint(-20, 20)
-                                virus.y = enemy.y + enemy.size
-                                virus.health = virus.max_health // 2
-                                self.enemies.append(virus)
-                        
-                        self.enemies.remove(enemy)
+                        ))
                     
-                    # Mermi delme
-                    if bullet['pierce'] > 0:
-                        bullet['pierced_enemies'] += 1
-                        if bullet['pierced_enemies'] > bullet['pierce']:
-                            bullet_hit = True
-                    else:
-                        bullet_hit = True
+                    # Virüs split özelliği
+                    if enemy.type == EnemyType.VIRUS and enemy.level > 1:
+                        for _ in range(2):
+                            virus = Enemy(EnemyType.VIRUS, enemy.level - 1)
+                            virus.x = enemy.x + rng_service.sim.randint(-20, 20)
+                            virus.y = enemy.y + enemy.size
+                            virus.health = virus.max_health // 2
+                            spawn_enemy(self.world, virus)
+                            grid.insert(virus, virus.x, virus.y, virus.size, virus.size)
+                            spawned.append((k, virus))
                     
-                    if bullet_hit:
-                        self.player.bullets.remove(bullet)
-                        break
+                    self.world.despawn(enemy.entity)
+                    grid.remove(enemy)
+                
+                # Mermi delme
+                if pool.pierce[i] > 0:
+                    pool.pierced[i] += 1
+                    if pool.pierced[i] > pool.pierce[i]:
+                        bullet_hit = True
+                else:
+                    bullet_hit = True
+                
+                if bullet_hit:
+                    spent.append(i)
+                    break
             
             # Boss ile çarpışma
             if self.boss and not bullet_hit and not self.boss.invulnerable:
-                if (bullet['x'] > self.boss.x and
-                    bullet['x'] < self.boss.x + self.boss.size and
-                    bullet['y'] > self.boss.y and
-                    bullet['y'] < self.boss.y + self.boss.size):
+                if (bullet_x > self.boss.x and
+                    bullet_x < self.boss.x + self.boss.size and
+                    bullet_y > self.boss.y and
+                    bullet_y < self.boss.y + self.boss.size):
                     
                     # Hasar hesapla
-                    damage = bullet['damage']
-                    if random.random() < self.player.critical_chance:
+                    damage = float(pool.damage[i])
+                    if rng_service.sim.random() < self.player.critical_chance:
                         damage *= 2
                     
                     self.boss.health -= damage
@@ -2402,39 +4357,39 @@ class GameManager:
                     
                     # Patlama efekti
                     self.particle_system.add_explosion(
-                        bullet['x'], bullet['y'], bullet['color']
+                        bullet_x, bullet_y, bullet_color
                     )
                     
                     # Kombo
                     self.player.add_combo()
                     
-                    if bullet['pierce'] > 0:
-                        bullet['pierced_enemies'] += 1
-                        if bullet['pierced_enemies'] > bullet['pierce']:
-                            self.player.bullets.remove(bullet)
+                    if pool.pierce[i] > 0:
+                        pool.pierced[i] += 1
+                        if pool.pierced[i] > pool.pierce[i]:
+                            spent.append(i)
                     else:
-                        self.player.bullets.remove(bullet)
+                        spent.append(i)
+        pool.remove(spent)
         
         # Düşman mermileri ile oyuncu
-        for enemy in self.enemies:
-            for bullet in enemy.bullets[:]:
-                if (bullet['x'] > self.player.x and
-                    bullet['x'] < self.player.x + self.player.width and
-                    bullet['y'] > self.player.y and
-                    bullet['y'] < self.player.y + self.player.height):
-                    
-                    if self.player.take_damage(enemy.level * 3):
-                        self.end_game()
-                        return
-                    
-                    # Patlama efekti
-                    self.particle_system.add_explosion(
-                        bullet['x'], bullet['y'], bullet['color']
-                    )
-                    enemy.bullets.remove(bullet)
+        pool.cull_orphans(self.world)
+        hits = []
+        for i in self.bullets_hitting_player(BulletPool.ENEMY):
+            if self.player.take_damage(int(pool.damage[i])):
+                pool.remove(hits)
+                self.end_game()
+                return
+            
+            # Patlama efekti
+            self.particle_system.add_explosion(
+                pool.x[i], pool.y[i], tuple(pool.color[i])
+            )
+            hits.append(i)
+        pool.remove(hits)
         
         # Düşmanlar ile oyuncu çarpışması
-        for enemy in self.enemies:
+        for enemy in grid.query_rect(self.player.x, self.player.y,
+                                     self.player.width, self.player.height):
             if (self.player.x < enemy.x + enemy.size and
                 self.player.x + self.player.width > enemy.x and
                 self.player.y < enemy.y + enemy.size and
@@ -2449,18 +4404,20 @@ class GameManager:
                 if enemy.health <= 0:
                     self.player.add_score(enemy.value)
                     self.player.stats['enemies_killed'] += 1
-                    self.enemies.remove(enemy)
+                    self.world.despawn(enemy.entity)
+                    grid.remove(enemy)
         
         # Powerup toplama
-        for powerup in self.powerups[:]:
-            distance = math.sqrt(
-                (powerup.x - (self.player.x + self.player.width//2))**2 +
-                (powerup.y - (self.player.y + self.player.height//2))**2
-            )
-            
+        if not self.powerups:
+            return
+        self.build_powerup_grid()
+        reach = self.player.width//2 + max(powerup.size for powerup in self.powerups)
+        for powerup, distance in self.powerup_grid.query_radius(
+                self.player.x + self.player.width//2,
+                self.player.y + self.player.height//2, reach):
             if distance < self.player.width//2 + powerup.size:
                 self.collect_powerup(powerup)
-                self.powerups.remove(powerup)
+                self.world.despawn(powerup.entity)
     
     def collect_powerup(self, powerup):
         if powerup.apply(self.player):
@@ -2495,62 +4452,93 @@ class GameManager:
         # Cutscene başlat
         self.cutscene_manager.play_cutscene("game_over")
         
-        # İstatistikleri kaydet
-        self.statistics.save_stats()
+        # İstatistikleri kaydet (başsız koşular oyuncu kaydına dokunmaz)
+        if not self.headless:
+            self.statistics.save_stats()
     
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
+        # Başsız modda çizim yapılmaz
+        if self.headless:
+            return None
+        with self.profiler.span('draw'):
+            if alpha >= 1.0:
+                return self.render(surface)
+            
+            saved = self.interpolator.apply(self, alpha)
+            try:
+                return self.render(surface)
+            finally:
+                self.interpolator.restore(saved)
+    
+    def render(self, surface):
         # Ekran titremesi için offset
-        shake_x = random.randint(-int(self.screen_shake), int(self.screen_shake))
-        shake_y = random.randint(-int(self.screen_shake), int(self.screen_shake))
+        shake_x = rng_service.fx.randint(-int(self.screen_shake), int(self.screen_shake))
+        shake_y = rng_service.fx.randint(-int(self.screen_shake), int(self.screen_shake))
         
-        # Geçici yüzey oluştur
-        temp_surface = pygame.Surface((WIDTH, HEIGHT))
+        # Kare yüzeyi havuzdan gelir, sadece boyut değişince yeniden oluşturulur
+        temp_surface = surface_pool.get('frame', (WIDTH, HEIGHT))
+        if temp_surface is not self.frame_surface:
+            self.frame_surface = temp_surface
+            self.dirty_rects.invalidate()
+        
+        profiler = self.profiler
         
         # Arkaplan
         temp_surface.fill(COLORS['black'])
         
         # Matrix yağmuru
-        self.matrix_rain.draw(temp_surface)
+        with profiler.section('draw.matrix_rain'):
+            self.matrix_rain.draw(temp_surface)
         
         # Hava durumu
-        self.weather_system.draw(temp_surface)
+        with profiler.section('draw.weather'):
+            self.weather_system.draw(temp_surface)
         
         # Zaman manipülasyonu efektleri
         self.time_manipulation.draw(temp_surface)
         
         # Parçacık sistemi
-        self.particle_system.draw(temp_surface)
+        with profiler.section('draw.particles'):
+            self.particle_system.draw(temp_surface)
         
         if self.state == GameState.MAIN_MENU:
             self.draw_main_menu(temp_surface)
         elif self.state in [GameState.PLAYING, GameState.PAUSED, GameState.GAME_OVER]:
-            # Düşmanları çiz
-            for enemy in self.enemies:
-                enemy.draw(temp_surface)
-            
-            # Powerup'ları çiz
-            for powerup in self.powerups:
-                powerup.draw(temp_surface)
+            with profiler.section('draw.enemies'):
+                # Düşmanları çiz
+                for enemy in self.enemies:
+                    enemy.draw(temp_surface)
+                
+                # Powerup'ları çiz
+                for powerup in self.powerups:
+                    powerup.draw(temp_surface)
             
             # Boss çiz
             if self.boss:
-                self.boss.draw(temp_surface)
+                with profiler.section('draw.boss'):
+                    self.boss.draw(temp_surface)
             
-            # Oyuncuyu çiz
-            self.player.draw(temp_surface)
-            
-            # HUD çiz
-            self.draw_hud(temp_surface)
-            
-            # Görevler
-            self.mission_system.draw(temp_surface)
+            with profiler.section('draw.player'):
+                # Oyuncuyu çiz
+                self.player.draw(temp_surface)
+                
+                # Mermileri çiz
+                bullet_pool.draw(temp_surface, self.player.bullet_size())
             
-            # AI Assistant
-            self.ai_assistant.draw(temp_surface)
+            with profiler.section('draw.hud'):
+                # HUD çiz
+                self.draw_hud(temp_surface)
+                
+                # Görevler
+                self.mission_system.draw(temp_surface)
+                
+                # AI Assistant
+                self.ai_assistant.draw(temp_surface)
             
             # Cutscene
             if self.cutscene_manager.active_cutscene:
-                self.cutscene_manager.draw(temp_surface)
+                with profiler.section('draw.cutscene'):
+                    self.cutscene_manager.draw(temp_surface)
             
             # Oyun durumuna özel ekranlar
             if self.state == GameState.PAUSED:
@@ -2562,8 +4550,148 @@ class GameManager:
         elif self.state == GameState.UPGRADE_SHOP:
             self.draw_upgrade_shop(temp_surface)
         
-        # Ekran titremesi uygula
-        surface.blit(temp_surface, (shake_x, shake_y))
+        with profiler.section('draw.present'):
+            if self.dirty_rect_mode:
+                rects = self.collect_dirty_rects()
+                if rects is not None:
+                    for rect in rects:
+                        surface.blit(temp_surface, rect, rect)
+                    return rects
+            
+            # Ekran titremesi uygula
+            surface.blit(temp_surface, (shake_x, shake_y))
+            return None
+    
+    def toggle_profiler(self):
+        self.profiler.toggle()
+        self.dirty_rects.invalidate()
+    
+    def toggle_trace(self):
+        # Kayıt açıksa durdurup dosyaya döker, kapalıysa başlatır
+        if self.profiler.tracer is None:
+            self.trace_state = None
+            self.profiler.start_trace()
+            return None
+        return self.profiler.stop_trace()
+    
+    def toggle_hitch_detector(self, budget_ms=HITCH_BUDGET_MS):
+        # Bekçi açıkken kaplama kapalı olsa da alt sistem süreleri toplanır
+        if self.hitch_detector is None:
+            self.hitch_detector = HitchDetector(budget_ms)
+        else:
+            self.hitch_detector.close()
+            self.hitch_detector = None
+        self.profiler.watchdog = self.hitch_detector is not None
+        self.profiler.collect(self.profiler.visible or self.profiler.watchdog)
+        return self.hitch_detector
+    
+    def toggle_memory_monitor(self, tracemalloc_frames=MEMORY_TRACE_FRAMES):
+        # Kapatılırken rapor dosyaya yazılır ve yolu döner
+        if self.memory_monitor is None:
+            self.memory_monitor = MemoryMonitor(tracemalloc_frames)
+            return None
+        monitor = self.memory_monitor
+        self.memory_monitor = None
+        monitor.sample(self, 'stop')
+        monitor.close()
+        path = datetime.datetime.now().strftime("matrix_memory_%Y%m%d_%H%M%S.json")
+        with open(path, 'w') as f:
+            json.dump(monitor.report(), f, indent=2)
+        return path
+    
+    def enable_gc_manager(self):
+        # Başlangıçta bir kez: o ana kadarki nesneler dondurulur
+        self.gc_manager = GCManager()
+        self.gc_manager.install(self.profiler)
+        self.gc_manager.freeze()
+        return self.gc_manager
+    
+    def end_frame(self, next_tick_ms=0.0):
+        profiler = self.profiler
+        elapsed_ms = (time.perf_counter() - profiler.frame_start) * 1000
+        profiler.end_frame(self.profiler_counts() if profiler.visible else None)
+        if self.hitch_detector is not None and profiler.enabled:
+            self.hitch_detector.check(self)
+        if self.gc_manager is not None:
+            self.gc_manager.frame(self, elapsed_ms, next_tick_ms)
+    
+    def profiler_counts(self):
+        counts = {
+            'enemies': len(self.enemies) + (len(self.boss.minions) if self.boss else 0),
+            'bullets': bullet_pool.count,
+            'particles': self.particle_system.count,
+            'weather particles': len(self.weather_system.particles),
+        }
+        if self.hitch_detector is not None:
+            counts['hitches'] = self.hitch_detector.count
+        if self.gc_manager is not None:
+            stats = self.gc_manager.stats.values()
+            counts['gc pauses'] = sum(stat['count'] for stat in stats)
+            counts['gc max ms'] = round(max(stat['max_ms'] for stat in stats), 2)
+        return counts
+    
+    def draw_profiler(self, surface, dirty):
+        # Kaplama ekrana en son çizilir; kirli dikdörtgen modunda alanı eklenir
+        rect = self.profiler.draw(surface)
+        if rect is not None and dirty is not None:
+            dirty.append(rect)
+        return dirty
+    
+    def set_dirty_rect_mode(self, enabled):
+        self.dirty_rect_mode = enabled
+        self.dirty_rects.invalidate()
+    
+    def needs_full_redraw(self):
+        return (int(self.screen_shake) != 0 or
+                self.time_manipulation.effects or
+                self.player.matrix_vision or
+                self.cutscene_manager.active_cutscene or
+                self.state not in [GameState.MAIN_MENU, GameState.PLAYING])
+    
+    def collect_dirty_rects(self):
+        # Ekran titremesi veya tam ekran efektlerde tüm ekran güncellenir
+        if self.needs_full_redraw():
+            self.dirty_rects.invalidate()
+            return None
+        
+        tracker = self.dirty_rects
+        tracker.extend(self.matrix_rain.dirty_rects())
+        tracker.extend(self.weather_system.dirty_rects())
+        tracker.extend(self.particle_system.dirty_rects())
+        
+        if self.state == GameState.MAIN_MENU:
+            tracker.extend(self.main_menu_rects())
+        else:
+            for enemy in self.enemies:
+                tracker.extend(enemy.dirty_rects())
+            for powerup in self.powerups:
+                tracker.extend(powerup.dirty_rects())
+            if self.boss:
+                tracker.extend(self.boss.dirty_rects())
+            tracker.extend(self.player.dirty_rects())
+            tracker.extend(bullet_pool.dirty_rects(self.player.bullet_size()))
+            tracker.extend(self.hud_rects())
+            tracker.extend(self.mission_system.dirty_rects())
+            tracker.extend(self.ai_assistant.dirty_rects())
+        
+        return tracker.finish_frame(pygame.Rect(0, 0, WIDTH, HEIGHT))
+    
+    def main_menu_rects(self):
+        return [
+            pygame.Rect(WIDTH//2 - 300, 90, 600, 130),
+            pygame.Rect(WIDTH//2 - 250, 280, 500, 6 * 70),
+            pygame.Rect(0, HEIGHT - 100, WIDTH, 100)
+        ]
+    
+    def hud_rects(self):
+        return [
+            pygame.Rect(20, 20, 300, 25),
+            pygame.Rect(20, 50, 200, 15),
+            pygame.Rect(20, 100, 300, 25 * len(self.player.powerups)),
+            pygame.Rect(WIDTH - 320, 20, 300, 100),
+            pygame.Rect(WIDTH//2 - 200, 20, 400, 20),
+            pygame.Rect(0, HEIGHT - 30, WIDTH, 30)
+        ]
     
     def draw_main_menu(self, surface):
         # Başlık
@@ -2729,9 +4857,7 @@ class GameManager:
     
     def draw_pause_menu(self, surface):
         # Karanlık arkaplan
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        surface.blit(overlay, (0, 0))
+        surface.blit(surface_pool.filled((0, 0, 0, 150), (WIDTH, HEIGHT)), (0, 0))
         
         # Ana kutu
         pause_rect = pygame.Rect(WIDTH//2 - 200, HEIGHT//2 - 150, 400, 300)
@@ -2769,9 +4895,7 @@ class GameManager:
     
     def draw_game_over(self, surface):
         # Karanlık arkaplan
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        surface.blit(overlay, (0, 0))
+        surface.blit(surface_pool.filled((0, 0, 0, 200), (WIDTH, HEIGHT)), (0, 0))
         
         # Ana kutu
         game_over_rect = pygame.Rect(WIDTH//2 - 300, HEIGHT//2 - 200, 600, 400)
@@ -2834,7 +4958,29 @@ class GameManager:
     def draw_upgrade_shop(self, surface):
         self.upgrade_system.draw_shop(surface, self.player)
     
+    def handle_key(self, key):
+        # Simülasyonu etkileyen tuş olayları; hata ayıklama tuşları ana döngüde kalır
+        if self.recorder is not None:
+            self.recorder.key(self.tick_count, key)
+        if key == pygame.K_p:
+            self.state = GameState.PAUSED if self.state == GameState.PLAYING else GameState.PLAYING
+        elif key == pygame.K_r and self.state == GameState.GAME_OVER:
+            self.start_game()
+        elif self.cutscene_manager.active_cutscene:
+            # herhangi bir tuşa basınca cutscene atla/ileri
+            self.cutscene_manager.active_cutscene = None
+    
+    def resize(self, width, height):
+        # Ekran boyutu doğma ve sınır hesaplarına girdiği için kayda alınır
+        if self.recorder is not None:
+            self.recorder.resize(self.tick_count, width, height)
+        set_resolution(width, height, self.headless)
+        self.matrix_rain.setup_columns()
+        self.dirty_rects.invalidate()
+    
     def handle_click(self, pos):
+        if self.recorder is not None:
+            self.recorder.click(self.tick_count, pos)
         if self.state == GameState.MAIN_MENU:
             self.handle_main_menu_click(pos)
         elif self.state == GameState.PAUSED:
@@ -2939,37 +5085,1055 @@ class GameManager:
             
             y_offset += 60
 
+# ==================== REPLAY ====================
+# Dosya: başlık + JSON üst veri, (tür, tik) önekli kayıtlar, anahtar kare dizini ve kuyruk
+REPLAY_MAGIC = b'MXRP'
+REPLAY_INDEX_MAGIC = b'MXIX'
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct('<4sHI')
+REPLAY_RECORD = struct.Struct('<BI')
+REC_END, REC_KEYS, REC_CLICK, REC_KEY, REC_RESIZE, REC_KEYFRAME = range(6)
+REPLAY_PAYLOADS = {
+    REC_END: struct.Struct('<8s'),
+    REC_KEYS: struct.Struct('<H'),
+    REC_CLICK: struct.Struct('<hh'),
+    REC_KEY: struct.Struct('<I'),
+    REC_RESIZE: struct.Struct('<HH'),
+    # Ardından boyutu kadar pickle verisi gelir
+    REC_KEYFRAME: struct.Struct('<IH'),
+}
+# Dizin girdisi: anahtar karenin tiki, dosya konumu, dalgası ve boss durumu
+REPLAY_INDEX = np.dtype([('tick', '<u4'), ('offset', '<u8'), ('wave', '<u2'), ('boss', 'u1')])
+REPLAY_TRAILER = struct.Struct('<QQI4s')
+# Bu kadar tikte bir tam durum saklanır; atlama en fazla bu kadar tik simülasyonu ister
+REPLAY_KEYFRAME_INTERVAL = TICK_RATE * 10
+# Simülasyonun okuduğu tuşlar; maskedeki bit sırası bu dizidir
+REPLAY_KEYS = (pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+               pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s, pygame.K_SPACE)
+
+class KeyframeUnpickler(pickle.Unpickler):
+    # Kayıtlar hata raporlarıyla paylaşılır: yalnızca SNAPSHOT_FIELDS altında bulunan veri sınıfları
+    # ve numpy dizi/skalerleri çözülür. Dosya, pencere ya da ölçüm tutan sınıflar (kaydedici,
+    # profiler, GameManager...) listede yoktur; kurucuları dosyadan gelen argümanlarla çağrılamaz.
+    # Oyun betik (__main__) ya da modül olarak çalışmış olabilir; sınıflar adıyla bu listeden alınır
+    GAME_CLASSES = {cls.__name__: cls for cls in (
+        GameState, EnemyType, PowerUpType, WeatherType, Mission, Upgrade, Achievement,
+        UpgradeSystem, MissionSystem, Archetype, World, MatrixBoss, Enemy, Player, PowerUp,
+        WeatherSystem, TimeManipulation, AIAssistant, Statistics, CutsceneManager,
+    )}
+    NUMPY_NAMES = {'_frombuffer', '_reconstruct', 'scalar', 'dtype', 'ndarray'}
+    
+    def find_class(self, module, name):
+        if module.split('.')[0] == 'numpy':
+            obj = super().find_class(module, name)
+            if name in self.NUMPY_NAMES or (isinstance(obj, type) and issubclass(obj, np.generic)):
+                return obj
+        elif module == 'collections' and name in ('deque', 'OrderedDict'):
+            return super().find_class(module, name)
+        elif name in self.GAME_CLASSES:
+            return self.GAME_CLASSES[name]
+        raise pickle.UnpicklingError(f"anahtar karede izin verilmeyen global: {module}.{name}")
+
+def argv_value(flag, default=None):
+    # "--bayrak DEĞER" biçimindeki basit komut satırı seçenekleri
+    if flag in sys.argv:
+        i = sys.argv.index(flag) + 1
+        if i < len(sys.argv) and not sys.argv[i].startswith('--'):
+            return sys.argv[i]
+    return default
+
+def key_mask(keys):
+    mask = 0
+    for bit, key in enumerate(REPLAY_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+def sim_digest(gm):
+    # Simülasyon durumunun kısa özeti; oynatmanın kayıtla aynı yere vardığını doğrular
+    digest = hashlib.blake2b(digest_size=8)
+    player = gm.player
+    digest.update(repr((gm.state.name, gm.tick_count, gm.wave, gm.game_time,
+                        player.score, player.health, player.x, player.y)).encode())
+    for enemy in gm.enemies:
+        digest.update(repr((enemy.x, enemy.y, enemy.health)).encode())
+    if gm.boss:
+        digest.update(repr((gm.boss.x, gm.boss.y, gm.boss.health, len(gm.boss.minions))).encode())
+    count = bullet_pool.count
+    digest.update(bullet_pool.x[:count].tobytes())
+    digest.update(bullet_pool.y[:count].tobytes())
+    digest.update(repr(rng_service.sim.getstate()).encode())
+    return digest.digest()
+
+class InputRecorder:
+    # Oturumu tohum + tik başına tuş maskesi farkları + tıklama/tuş olayları olarak dosyaya akıtır
+    def __init__(self, path, seed, autostart=False, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.mask = 0
+        self.records = 0
+        self.index = []
+        self.file = open(path, 'wb')
+        meta = json.dumps({
+            'seed': seed,
+            'tick_rate': TICK_RATE,
+            'width': WIDTH,
+            'height': HEIGHT,
+            'keys': list(REPLAY_KEYS),
+            'autostart': autostart,
+            'keyframe_interval': keyframe_interval,
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+        }).encode()
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, len(meta)) + meta)
+        self.offset = REPLAY_HEADER.size + len(meta)
+    
+    def write(self, kind, tick, *value, blob=b''):
+        data = REPLAY_RECORD.pack(kind, tick) + REPLAY_PAYLOADS[kind].pack(*value)
+        self.file.write(data)
+        self.file.write(blob)
+        self.offset += len(data) + len(blob)
+        self.records += 1
+    
+    def tick(self, gm, keys):
+        # Yalnızca maske değiştiğinde kayıt düşülür; aralık başlarında tam durum saklanır
+        tick = gm.tick_count
+        mask = key_mask(keys)
+        if mask != self.mask:
+            self.mask = mask
+            self.write(REC_KEYS, tick, mask)
+        if self.keyframe_interval and tick % self.keyframe_interval == 0:
+            self.keyframe(gm)
+    
+    def keyframe(self, gm):
+        state = gm.save_state()
+        self.index.append((gm.tick_count, self.offset, gm.wave, gm.boss is not None))
+        self.write(REC_KEYFRAME, gm.tick_count, len(state), self.mask, blob=state)
+    
+    def click(self, tick, pos):
+        self.write(REC_CLICK, tick, *pos)
+    
+    def key(self, tick, key):
+        self.write(REC_KEY, tick, key)
+    
+    def resize(self, tick, width, height):
+        self.write(REC_RESIZE, tick, width, height)
+    
+    def close(self, gm):
+        # Son kayıt toplam tik sayısı ve doğrulama özetini taşır; ardından dizin ve kuyruk yazılır
+        end = self.offset
+        self.write(REC_END, gm.tick_count, sim_digest(gm))
+        self.file.write(np.array(self.index, dtype=REPLAY_INDEX).tobytes())
+        self.file.write(REPLAY_TRAILER.pack(self.offset, end, len(self.index), REPLAY_INDEX_MAGIC))
+        self.file.close()
+        return self.path
+
+class Replay:
+    # Kayıt dosyası belleğe eşlenir; kayıtlar oynatılırken yerinde çözülür
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self.data
+        magic, version, meta_size = REPLAY_HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or not 1 <= version <= REPLAY_VERSION:
+            raise ValueError(f"{path}: desteklenmeyen kayıt dosyası")
+        self.start = REPLAY_HEADER.size + meta_size
+        self.meta = json.loads(data[REPLAY_HEADER.size:self.start])
+        
+        if len(data) >= self.start + REPLAY_TRAILER.size and data[-4:] == REPLAY_INDEX_MAGIC:
+            index_offset, self.end, count, _ = REPLAY_TRAILER.unpack_from(data, len(data) - REPLAY_TRAILER.size)
+            self.index = np.frombuffer(data, REPLAY_INDEX, count, index_offset).copy()
+            kind, self.ticks, value, _ = self.read(self.end)
+            self.digest = value[0]
+        else:
+            self.scan()
+    
+    def scan(self):
+        # Dizini olmayan (yarıda kesilmiş) kayıt: bir kez baştan taranır, son olaya kadar oynatılır.
+        # Dalga ve boss durumu dalgaya atlama için her anahtar karenin kendisinden okunur
+        entries = []
+        offset = self.start
+        self.ticks = 0
+        self.digest = None
+        while True:
+            record = self.read(offset)
+            if record is None:
+                break
+            kind, tick, value, following = record
+            if kind == REC_END:
+                self.ticks, self.digest = tick, value[0]
+                break
+            if kind == REC_KEYFRAME:
+                state = KeyframeUnpickler(io.BytesIO(self.data[following - value[0]:following])).load()[0]
+                entries.append((tick, offset, state['wave'], state['boss'] is not None))
+            self.ticks = tick
+            offset = following
+        self.end = offset
+        self.index = np.array(entries, dtype=REPLAY_INDEX)
+    
+    def read(self, offset):
+        # offset'teki kaydı çözer: (tür, tik, değer, sonraki konum); yarım kayıtta None
+        data = self.data
+        if offset + REPLAY_RECORD.size > len(data):
+            return None
+        kind, tick = REPLAY_RECORD.unpack_from(data, offset)
+        payload = REPLAY_PAYLOADS[kind]
+        offset += REPLAY_RECORD.size
+        if offset + payload.size > len(data):
+            return None
+        value = payload.unpack_from(data, offset)
+        offset += payload.size
+        if kind == REC_KEYFRAME:
+            offset += value[0]
+            if offset > len(data):
+                return None
+        return kind, tick, value, offset
+    
+    def keyframe_before(self, tick):
+        # Hedef tikte veya öncesindeki son anahtar kare
+        i = int(np.searchsorted(self.index['tick'], tick, side='right')) - 1
+        return self.index[i] if i >= 0 else None
+    
+    def close(self):
+        self.data.close()
+
+class ReplayPlayer:
+    # Kaydı GameManager.tick / handle_click / handle_key üzerinden aynı sırayla yeniden besler
+    def __init__(self, replay):
+        self.replay = replay
+        self.keys = replay.meta['keys']
+        self.input = HeadlessInput()
+        self.offset = replay.start
+    
+    def start(self, headless=True):
+        # Kayıttaki tohum ve çözünürlükle yeni bir oyun kurar
+        meta = self.replay.meta
+        rng_service.seed(meta['seed'])
+        set_resolution(meta['width'], meta['height'], headless)
+        gm = GameManager(headless=headless)
+        if meta['autostart']:
+            gm.start_game()
+        return gm
+    
+    def mask_input(self, mask):
+        return HeadlessInput(key for bit, key in enumerate(self.keys) if mask >> bit & 1)
+    
+    def step(self, gm):
+        # Bu tikten önce gelen olaylar uygulanır, sonra bir tik ilerlenir; kayıt bitince False
+        replay = self.replay
+        while self.offset < replay.end:
+            kind, tick, value, following = replay.read(self.offset)
+            if tick > gm.tick_count:
+                break
+            self.offset = following
+            if kind == REC_KEYS:
+                self.input = self.mask_input(value[0])
+            elif kind == REC_CLICK:
+                gm.handle_click(value)
+            elif kind == REC_KEY:
+                gm.handle_key(value[0])
+            elif kind == REC_RESIZE:
+                gm.resize(*value)
+        if gm.tick_count >= replay.ticks:
+            return False
+        gm.tick(self.input)
+        return True
+    
+    def restore(self, gm, entry):
+        # Anahtar kare yüklenir; oynatma o kaydın hemen arkasından sürer
+        kind, tick, (size, mask), following = self.replay.read(int(entry['offset']))
+        gm.load_state(self.replay.data[following - size:following])
+        self.input = self.mask_input(mask)
+        self.offset = following
+    
+    def seek(self, gm, tick):
+        # Maliyet: en fazla bir anahtar kare yüklemesi + bir aralık kadar tik
+        tick = min(tick, self.replay.ticks)
+        entry = self.replay.keyframe_before(tick)
+        if entry is not None and (tick < gm.tick_count or entry['tick'] > gm.tick_count):
+            self.restore(gm, entry)
+        while gm.tick_count < tick and self.step(gm):
+            pass
+        return gm.tick_count
+    
+    def seek_wave(self, gm, wave, boss=False):
+        # Dizinde dalgayı (boss=True ise boss savaşını) ilk gösteren kareden bir öncekine atlanır
+        index = self.replay.index
+        reached = (index['wave'] > wave) | ((index['wave'] == wave) & (index['boss'] >= boss))
+        hits = np.flatnonzero(reached)
+        first = int(hits[0]) if len(hits) else len(index)
+        if first > 0:
+            self.restore(gm, index[first - 1])
+        while not (gm.wave > wave or (gm.wave == wave and (gm.boss is not None or not boss))):
+            if not self.step(gm):
+                break
+        return gm.tick_count
+    
+    def handle_key(self, gm, key):
+        # Pencerede oynatma: PageUp/PageDown bir aralık geri/ileri, N sonraki dalga, B sıradaki boss
+        interval = self.replay.meta.get('keyframe_interval') or REPLAY_KEYFRAME_INTERVAL
+        if key == pygame.K_PAGEDOWN:
+            self.seek(gm, gm.tick_count + interval)
+        elif key == pygame.K_PAGEUP:
+            self.seek(gm, max(0, gm.tick_count - interval))
+        elif key == pygame.K_n:
+            self.seek_wave(gm, gm.wave + 1)
+        elif key == pygame.K_b:
+            self.seek_wave(gm, gm.wave + 1 if gm.boss else gm.wave, boss=True)
+    
+    def verify(self, gm):
+        # Kayıt özeti yoksa (yarım dosya) doğrulanamaz
+        if self.replay.digest is None:
+            return None
+        return sim_digest(gm) == self.replay.digest
+
+def run_replay(path, seek=None, seek_wave=None, boss=False):
+    # Kaydı pencere açmadan ve hiç çizmeden, CPU'nun izin verdiği hızda oynatır
+    replay = Replay(path)
+    player = ReplayPlayer(replay)
+    gm = player.start(headless=True)
+    
+    start = time.perf_counter()
+    if seek is not None:
+        player.seek(gm, seek)
+    elif seek_wave is not None:
+        player.seek_wave(gm, seek_wave, boss)
+    seek_seconds = time.perf_counter() - start
+    seek_tick = gm.tick_count
+    while player.step(gm):
+        pass
+    elapsed = time.perf_counter() - start
+    
+    result = {
+        'replay': path,
+        'ticks': gm.tick_count,
+        'seconds': elapsed,
+        'ticks_per_second': gm.tick_count / elapsed if elapsed > 0 else 0.0,
+        'keyframes': len(replay.index),
+        'state': gm.state.name,
+        'wave': gm.wave,
+        'score': gm.player.score,
+        'digest': sim_digest(gm).hex(),
+        'verified': player.verify(gm)
+    }
+    if seek is not None or seek_wave is not None:
+        result['seek_tick'] = seek_tick
+        result['seek_seconds'] = seek_seconds
+    replay.close()
+    return result
+
+# ==================== HEADLESS RUNNER ====================
+class HeadlessInput:
+    # pygame.key.get_pressed() yerine geçen basılı tuş kümesi
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+    
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class AutoPilot:
+    # Denge koşuları için basit oyuncu: sürekli ateş eder, en yakın düşmanın altına kayar
+    def __init__(self, gm):
+        self.gm = gm
+    
+    def keys(self):
+        gm = self.gm
+        pressed = {pygame.K_SPACE}
+        targets = gm.enemies or (gm.boss.minions + [gm.boss] if gm.boss else [])
+        if targets:
+            center = gm.player.x + gm.player.width//2
+            target = min(targets, key=lambda t: abs(t.x + t.size//2 - center))
+            offset = target.x + target.size//2 - center
+            if offset < -gm.player.speed:
+                pressed.add(pygame.K_LEFT)
+            elif offset > gm.player.speed:
+                pressed.add(pygame.K_RIGHT)
+        return HeadlessInput(pressed)
+
+def run_headless(ticks, seed=None, autopilot=True, skip_cutscenes=True, memory=False, record=None,
+                 keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+    # Simülasyonu pencere açmadan, CPU'nun izin verdiği hızda ilerletir
+    seed = rng_service.seed(seed)
+    
+    gm = GameManager(headless=True)
+    if record:
+        gm.recorder = InputRecorder(record, seed, autostart=True, keyframe_interval=keyframe_interval)
+    gm.start_game()
+    if memory:
+        gm.memory_monitor = MemoryMonitor(tracemalloc_frames=MEMORY_TRACE_FRAMES)
+    pilot = AutoPilot(gm) if autopilot else None
+    idle = HeadlessInput()
+    
+    start = time.perf_counter()
+    tick = 0
+    while tick < ticks:
+        if skip_cutscenes and gm.cutscene_manager.active_cutscene == "game_over":
+            gm.state = GameState.GAME_OVER
+        if skip_cutscenes and gm.cutscene_manager.active_cutscene:
+            # Tuş olayı olarak atlanır ki kayıt oynatılınca aynı tikte atlansın
+            gm.handle_key(pygame.K_RETURN)
+        if gm.state != GameState.PLAYING:
+            break
+        gm.tick(pilot.keys() if pilot else idle)
+        tick += 1
+    elapsed = time.perf_counter() - start
+    
+    result = {
+        'ticks': tick,
+        'seconds': elapsed,
+        'ticks_per_second': tick / elapsed if elapsed > 0 else 0.0,
+        'state': gm.state.name,
+        'wave': gm.wave,
+        'score': gm.player.score,
+        'health': gm.player.health,
+        'enemies_killed': gm.player.stats['enemies_killed'],
+        'shots_fired': gm.player.stats['shots_fired'],
+        'shots_hit': gm.player.stats['shots_hit'],
+        'seed': seed
+    }
+    if memory:
+        gm.memory_monitor.sample(gm, 'stop')
+        gm.memory_monitor.close()
+        result['memory'] = gm.memory_monitor.report()
+    if record:
+        result['replay'] = gm.recorder.close(gm)
+    return result
+
+def headless_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Başsız simülasyon koşusu")
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--ticks', type=int, default=TICK_RATE * 60 * 5)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--idle', action='store_true', help="oto-pilot yerine boş girdi")
+    parser.add_argument('--memory', action='store_true', help="dalga başına bellek örnekleri")
+    parser.add_argument('--record', help="oturumu bu dosyaya kaydet (birden çok koşuda -N eki alır)")
+    parser.add_argument('--keyframes', type=int, default=REPLAY_KEYFRAME_INTERVAL,
+                        help="kayıtta kaç tikte bir tam durum saklanacağı (0: hiç)")
+    parser.add_argument('--replay', nargs='+', help="kayıtları çizmeden hızlı oynat ve doğrula")
+    parser.add_argument('--seek', type=int, default=None, help="oynatmadan önce bu tike atla")
+    parser.add_argument('--seek-wave', type=int, default=None, help="oynatmadan önce bu dalgaya atla")
+    parser.add_argument('--boss', action='store_true', help="--seek-wave ile: dalganın boss savaşına atla")
+    args = parser.parse_args(argv)
+    
+    if args.replay:
+        # Kayıtlar hata yeniden üretimi ve gerçek oturum kıyaslama derlemi olarak oynatılır
+        code = 0
+        for path in args.replay:
+            result = run_replay(path, args.seek, args.seek_wave, args.boss)
+            print(json.dumps(result))
+            if result['verified'] is False:
+                code = 1
+        return code
+    
+    for i in range(args.runs):
+        seed = None if args.seed is None else args.seed + i
+        record = args.record
+        if record and args.runs > 1:
+            base, ext = os.path.splitext(record)
+            record = f"{base}-{i}{ext}"
+        print(json.dumps(run_headless(args.ticks, seed, autopilot=not args.idle, memory=args.memory,
+                                      record=record, keyframe_interval=args.keyframes)))
+    return 0
+
+# ==================== BENCHMARK SUITE ====================
+def bench_fill_enemies(gm, count, types, level, top=0, bottom=HEIGHT // 2):
+    # Sahnedeki yükü sabit tutmak için eksilen düşmanları tamamlar
+    while len(gm.enemies) < count:
+        enemy = Enemy(rng_service.sim.choice(types), level)
+        enemy.x = rng_service.sim.randint(0, WIDTH - enemy.size)
+        enemy.y = rng_service.sim.randint(top, bottom)
+        spawn_enemy(gm.world, enemy)
+
+def scenario_wave_20(gm):
+    # Dalga 20, ekranda 150 karışık düşman
+    gm.wave = 20
+    gm.enemies_spawned = gm.wave * gm.enemies_per_wave
+    types = [t for t in EnemyType if t != EnemyType.BOSS]
+    bench_fill_enemies(gm, 150, types, 5)
+    return lambda gm: bench_fill_enemies(gm, 150, types, 5)
+
+# Boss senaryosunda tutulan en fazla minion (bir spawn_minions dalgası)
+BENCH_BOSS_MINIONS = 3
+
+def scenario_boss_phase_3(gm):
+    # Boss 3. fazda, kalkan duvarı ve zaman yavaşlatma açık
+    gm.wave = 15
+    gm.spawn_boss()
+    gm.cutscene_manager.active_cutscene = None
+    boss = gm.boss
+    boss.y = 100
+    boss.pattern = 1
+    boss.phase = 3
+    boss.max_health = 10**9
+    boss.health = boss.max_health // 4
+    boss.activate_shield_wall()
+    boss.activate_time_slow()
+    # Başlangıç hava parçacıkları sönerken yük değişmesin
+    gm.weather_system.particles.clear()
+    
+    beam = [None]
+    
+    def sustain(gm):
+        # Yük koşu uzunluğundan bağımsız kalsın: kalkan düşünce eski kalkan mermileri
+        # silinip yenisi kurulur, fazla minionlar kaldırılır
+        boss = gm.boss
+        if not boss:
+            return
+        pool = bullet_pool
+        if not boss.invulnerable:
+            pool.remove(np.flatnonzero(pool.flags[:pool.count] & BulletPool.SHIELD))
+            boss.activate_shield_wall()
+        for minion in boss.minions[BENCH_BOSS_MINIONS:]:
+            gm.world.despawn(minion.entity)
+        
+        # Durağan lazer ışınları oyunda hiç silinmez; ışının mermileri aynı x'te durur,
+        # yalnızca en son ışın tutulur
+        lasers = np.flatnonzero(pool.flags[:pool.count] & BulletPool.LASER)
+        fresh = set(pool.x[lasers].tolist()) - {beam[0]}
+        if fresh:
+            beam[0] = fresh.pop()
+        pool.remove(lasers[pool.x[lasers] != beam[0]])
+    return sustain
+
+# Fırtına senaryosunda sürekli canlı tutulan hava parçacığı sayısı
+BENCH_STORM_PARTICLES = 300
+
+def scenario_glitch_storm(gm):
+    # GLITCH_STORM hava durumu ve Matrix Vision birlikte
+    gm.wave = 6
+    gm.enemies_spawned = gm.wave * gm.enemies_per_wave
+    # Başlangıçtaki veri yağmuru parçacıkları fırtına alanlarını taşımaz
+    gm.weather_system.particles.clear()
+    gm.weather_system.set_weather(WeatherType.GLITCH_STORM, 1.5, 10**9)
+    gm.player.powerups['matrix_vision'] = 10**9
+    types = [EnemyType.BASIC, EnemyType.HACKER, EnemyType.GLITCH]
+    bench_fill_enemies(gm, 40, types, 3)
+    
+    def sustain(gm):
+        # Fırtına her tik hedef parçacık sayısına tamamlanır (fazlası kırpılır)
+        particles = gm.weather_system.particles
+        while len(particles) < BENCH_STORM_PARTICLES:
+            gm.weather_system.create_glitch_storm(1.5)
+        del particles[BENCH_STORM_PARTICLES:]
+        bench_fill_enemies(gm, 40, types, 3)
+    sustain(gm)
+    return sustain
+
+def scenario_quantum_virus(gm):
+    # Quantum + hızlı ateş, bölünen VIRUS sürüsüne karşı
+    gm.wave = 10
+    gm.enemies_spawned = gm.wave * gm.enemies_per_wave
+    gm.player.powerups['quantum'] = 10**9
+    gm.player.powerups['rapid_fire'] = 10**9
+    bench_fill_enemies(gm, 60, [EnemyType.VIRUS], 5)
+    return lambda gm: bench_fill_enemies(gm, 60, [EnemyType.VIRUS], 5)
+
+BENCH_SCENARIOS = OrderedDict([
+    ("wave_20_150_enemies", scenario_wave_20),
+    ("boss_phase_3_shield_wall", scenario_boss_phase_3),
+    ("glitch_storm_matrix_vision", scenario_glitch_storm),
+    ("quantum_rapid_fire_virus_splits", scenario_quantum_virus),
+])
+
+def bench_percentiles(samples):
+    values = np.asarray(samples, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'p50': round(float(p50), 4),
+        'p95': round(float(p95), 4),
+        'p99': round(float(p99), 4),
+        'mean': round(float(values.mean()), 4),
+        'max': round(float(values.max()), 4),
+    }
+
+def run_benchmark(name, ticks=600, warmup=120, seed=1234, gc_managed=False):
+    # Tohumlanmış senaryoyu başsız koşturur; update ve draw ayrı ölçülür
+    rng_service.seed(seed)
+    gm = GameManager(headless=False)
+    gm.start_game()
+    gm.cutscene_manager.active_cutscene = None
+    gm.player.health = gm.player.max_health = 10**9
+    gm.weather_change_timer = 10**9
+    sustain = BENCH_SCENARIOS[name](gm)
+    pilot = AutoPilot(gm)
+    
+    # Duraklamalar her iki modda da ölçülür; yönetim sadece istenirse açılır
+    collector = GCManager()
+    collector.install(gm.profiler)
+    if gc_managed:
+        collector.freeze()
+    
+    update_ms = []
+    draw_ms = []
+    collections = None
+    for i in range(warmup + ticks):
+        if i == warmup:
+            collections = [stats['collections'] for stats in gc.get_stats()]
+            collector.pauses.clear()
+            for stats in collector.stats.values():
+                stats.update(count=0, total_ms=0.0, max_ms=0.0)
+            collector.reasons.clear()
+        gm.cutscene_manager.active_cutscene = None
+        if sustain:
+            sustain(gm)
+        keys = pilot.keys()
+        pygame.event.pump()
+        
+        t0 = time.perf_counter()
+        gm.tick(keys)
+        t1 = time.perf_counter()
+        gm.draw(screen)
+        t2 = time.perf_counter()
+        if gc_managed:
+            # Her tur bir tik: sıradaki tik kare başından bir tik süresi sonra gelir
+            elapsed = (t2 - t0) * 1000
+            collector.frame(gm, elapsed, 1000.0 / TICK_RATE - elapsed)
+        
+        if i >= warmup:
+            update_ms.append((t1 - t0) * 1000)
+            draw_ms.append((t2 - t1) * 1000)
+    
+    collections = [stats['collections'] - before
+                   for stats, before in zip(gc.get_stats(), collections)]
+    collector.uninstall()
+    entities = {
+        'enemies': len(gm.enemies),
+        'minions': len(gm.boss.minions) if gm.boss else 0,
+        'bullets': bullet_pool.count,
+        'particles': gm.particle_system.count,
+        'weather_particles': len(gm.weather_system.particles),
+    }
+    alloc = bench_allocations(gm, sustain, pilot, min(ticks, BENCH_ALLOC_TICKS))
+    return {
+        'ticks': ticks,
+        'warmup': warmup,
+        'seed': seed,
+        'update_ms': bench_percentiles(update_ms),
+        'draw_ms': bench_percentiles(draw_ms),
+        'alloc_kb': alloc,
+        'gc_collections': collections,
+        'gc': dict(collector.report(), managed=gc_managed),
+        'entities': entities,
+    }
+
+# Tahsis geçişinin en fazla tik sayısı; tracemalloc koşuyu belirgin yavaşlatır
+BENCH_ALLOC_TICKS = 120
+
+def bench_allocations(gm, sustain, pilot, ticks):
+    # Zamanlanan döngüden sonra ayrı bir geçişte tracemalloc ile ölçülür.
+    # peak: aşama içinde başlangıcın üstüne çıkılan en yüksek bayt (brüt geçici tahsis),
+    # net: aşama sonundaki fark (serbest bırakılanlar düşülmüş, negatif olabilir)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    samples = {'update_peak': [], 'update_net': [], 'draw_peak': [], 'draw_net': []}
+    for _ in range(ticks):
+        gm.cutscene_manager.active_cutscene = None
+        if sustain:
+            sustain(gm)
+        keys = pilot.keys()
+        pygame.event.pump()
+        for phase, step in (('update', lambda: gm.tick(keys)), ('draw', lambda: gm.draw(screen))):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            step()
+            current, peak = tracemalloc.get_traced_memory()
+            samples[phase + '_peak'].append(peak - before)
+            samples[phase + '_net'].append(current - before)
+    if started:
+        tracemalloc.stop()
+    result = {name + '_mean': round(float(np.mean(values)) / 1024, 2) for name, values in samples.items()}
+    result['ticks'] = ticks
+    return result
+
+def micro_matrix_rain_draw(gm, canvas, n):
+    # n kolon, hızlar değişmeden; kolonlar tamamen ekranda ve sabit durur ki
+    # görünür glif sayısı n ile doğrusal artsın
+    rain = gm.matrix_rain
+    rain.setup_columns(n)
+    rain.y = rng_service.np_fx.uniform(rain.length * FONT_SIZE, HEIGHT - 1)
+    return (lambda: rain.draw(canvas)), None, (lambda: int(np.count_nonzero(rain.visible_glyphs()[0])))
+
+def micro_enemy_draw(gm, canvas, n):
+    types = [t for t in EnemyType if t != EnemyType.BOSS]
+    enemies = []
+    for i in range(n):
+        enemy = Enemy(types[i % len(types)], 3)
+        enemy.y = rng_service.sim.randint(0, HEIGHT - enemy.size)
+        enemies.append(enemy)
+    
+    def step():
+        for enemy in enemies:
+            enemy.draw(canvas)
+    return step, None
+
+def micro_particles(gm, n):
+    particles = gm.particle_system
+    
+    def refill():
+        while particles.count < n:
+            particles.add_explosion(rng_service.sim.randint(0, WIDTH), rng_service.sim.randint(0, HEIGHT),
+                                    COLORS['matrix_green'], min(50, n - particles.count))
+            particles.add_matrix_rain(rng_service.sim.randint(0, WIDTH), rng_service.sim.randint(0, HEIGHT))
+    return refill
+
+def micro_particles_update(gm, canvas, n):
+    return gm.particle_system.update, micro_particles(gm, n)
+
+def micro_particles_draw(gm, canvas, n):
+    refill = micro_particles(gm, n)
+    refill()
+    return (lambda: gm.particle_system.draw(canvas)), None
+
+def micro_weather(gm, n):
+    weather = gm.weather_system
+    weather.particles.clear()
+    weather.current_weather = WeatherType.DATA_RAIN
+    weather.weather_timer = 10**9
+    
+    def refill():
+        while len(weather.particles) < n:
+            weather.create_data_rain(1.0)
+        del weather.particles[n:]
+    return refill
+
+def micro_weather_update(gm, canvas, n):
+    return gm.weather_system.update, micro_weather(gm, n)
+
+def micro_weather_draw(gm, canvas, n):
+    refill = micro_weather(gm, n)
+    refill()
+    return (lambda: gm.weather_system.draw(canvas)), None
+
+def micro_check_collisions(gm, canvas, n):
+    # n düşman ve n oyuncu mermisi; ölenler her turdan önce yenilenir
+    gm.wave = 6
+    gm.player.health = gm.player.max_health = 10**9
+    types = [t for t in EnemyType if t != EnemyType.BOSS]
+    
+    def refill():
+        bench_fill_enemies(gm, n, types, 3)
+        missing = n - bullet_pool.count_faction(BulletPool.PLAYER)
+        if missing > 0:
+            bullet_pool.spawn(BulletPool.PLAYER,
+                              rng_service.np_sim.integers(0, WIDTH, missing).astype(np.float64),
+                              rng_service.np_sim.integers(0, HEIGHT // 2, missing).astype(np.float64),
+                              0, -10, 0, COLORS['matrix_green'], damage=10)
+    return gm.check_collisions, refill
+
+def micro_boss_minions(gm, canvas, n):
+    # Boss savaşında n minion; minion sistemi her birini ölüm ve oyuncu çarpışması için dolaşır
+    gm.boss = MatrixBoss(3, gm.world)
+    gm.world.spawn(('boss',), boss=gm.boss)
+    for _ in range(n):
+        minion = Enemy(EnemyType.VIRUS, 1)
+        minion.x = rng_service.sim.randint(0, WIDTH - minion.size)
+        minion.y = rng_service.sim.randint(0, HEIGHT // 2)
+        spawn_enemy(gm.world, minion, minion=True)
+    return (lambda: gm.minion_system(1.0)), None
+
+def micro_boss_update(gm, canvas, n):
+    # Havuzda n boss mermisi varken her tur bir saldırı ateşlenir; güncelleme yükten bağımsız olmalı
+    gm.boss = MatrixBoss(3, gm.world)
+    gm.world.spawn(('boss',), boss=gm.boss)
+    boss = gm.boss
+    boss.y = 100
+    boss.pattern = 1
+    player = gm.player
+    
+    def refill():
+        bullet_pool.clear()
+        bullet_pool.spawn(BulletPool.BOSS,
+                          rng_service.np_sim.integers(0, WIDTH, n).astype(np.float64),
+                          rng_service.np_sim.integers(0, HEIGHT, n).astype(np.float64),
+                          0, 2, 8, boss.color, owner=boss.entity, damage=10)
+        boss.attack_timer = 1
+    return (lambda: boss.update(player.x, player.y)), refill
+
+def micro_player_update(gm, canvas, n):
+    # n iz parçacığı; ateş eden oyuncu her tur havuza mermi ekler
+    player = gm.player
+    keys = HeadlessInput({pygame.K_SPACE, pygame.K_LEFT})
+    
+    def refill():
+        bullet_pool.clear()
+        while len(player.trail_particles) < n:
+            player.trail_particles.append({
+                'x': player.x, 'y': player.y, 'size': 3,
+                'life': 10**6, 'color': COLORS['matrix_green']
+            })
+    return (lambda: player.update(keys)), refill
+
+def micro_draw_hud(gm, canvas, n):
+    # n etkin powerup (en fazla 7)
+    for i, name in enumerate(gm.player.powerups):
+        gm.player.powerups[name] = 600 if i < n else 0
+    gm.player.combo = 5
+    gm.player.combo_timer = 90
+    return (lambda: gm.draw_hud(canvas)), None
+
+MICRO_TARGETS = OrderedDict([
+    ("matrix_rain.draw", (micro_matrix_rain_draw, None)),
+    ("enemy.draw", (micro_enemy_draw, None)),
+    ("particles.update", (micro_particles_update, None)),
+    ("particles.draw", (micro_particles_draw, None)),
+    ("weather.update", (micro_weather_update, None)),
+    ("weather.draw", (micro_weather_draw, None)),
+    ("check_collisions", (micro_check_collisions, None)),
+    ("boss.update", (micro_boss_update, None)),
+    ("boss.minions", (micro_boss_minions, None)),
+    ("player.update", (micro_player_update, None)),
+    ("draw_hud", (micro_draw_hud, 7)),
+])
+
+def run_micro(name, sizes, repeat=50, seed=1234):
+    # Her boyut için taze oyun kurulur; sadece hedef çağrı ölçülür
+    setup, limit = MICRO_TARGETS[name]
+    canvas = pygame.Surface((WIDTH, HEIGHT))
+    if limit:
+        # Üst sınırı olan hedeflerde boyutlar sınır aralığına ölçeklenir
+        sizes = sorted({max(1, round(limit * n / max(sizes))) for n in sizes})
+    points = []
+    for n in sizes:
+        rng_service.seed(seed)
+        gm = GameManager(headless=False)
+        gm.start_game()
+        gm.cutscene_manager.active_cutscene = None
+        target = setup(gm, canvas, n)
+        step, refill = target[:2]
+        # İsteğe bağlı üçüncü öğe: n'den farklıysa gerçekten işlenen öğe sayısı
+        items = target[2]() if len(target) > 2 else n
+        
+        samples = []
+        for _ in range(repeat):
+            if refill:
+                refill()
+            t0 = time.perf_counter()
+            step()
+            samples.append((time.perf_counter() - t0) * 1000)
+        stats = bench_percentiles(samples)
+        points.append({'n': n, 'items': items, 'p50': stats['p50'], 'p95': stats['p95'],
+                       'us_per_item': round(stats['p50'] * 1000 / max(items, 1), 4)})
+    
+    # log-log eğimi (işlenen öğe sayısına göre): ~0 sabit, ~1 doğrusal, ~2 karesel
+    ns = np.array([p['items'] for p in points if p['items'] > 0], dtype=np.float64)
+    ms = np.array([max(p['p50'], 1e-6) for p in points if p['items'] > 0])
+    exponent = None
+    if np.unique(ns).size >= 2:
+        exponent = round(float(np.polyfit(np.log(ns), np.log(ms), 1)[0]), 3)
+    return {'points': points, 'exponent': exponent, 'repeat': repeat}
+
+def bench_meta(seed, ticks, warmup):
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'ticks': ticks,
+        'warmup': warmup,
+    }
+
+def bench_compare(base, new, threshold=0.10, min_ms=0.05):
+    # Her senaryo/aşama/yüzdelik için göreli artışı eşikle karşılaştırır
+    regressions = []
+    rows = []
+    for name, result in new['scenarios'].items():
+        if name not in base['scenarios']:
+            continue
+        for phase in ('update_ms', 'draw_ms'):
+            for key in ('p50', 'p95', 'p99'):
+                old = base['scenarios'][name][phase][key]
+                cur = result[phase][key]
+                change = (cur - old) / old if old > 0 else 0.0
+                row = {'scenario': name, 'phase': phase, 'stat': key,
+                       'base': old, 'new': cur, 'change': round(change, 4)}
+                rows.append(row)
+                if change > threshold and cur - old > min_ms:
+                    regressions.append(row)
+    return rows, regressions
+
+def bench_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Senaryo kıyaslama paketi")
+    parser.add_argument('--bench', action='store_true')
+    commands = parser.add_subparsers(dest='command')
+    
+    run = commands.add_parser('run', help="senaryoları koştur, JSON yaz")
+    run.add_argument('--scenario', action='append', choices=list(BENCH_SCENARIOS))
+    run.add_argument('--ticks', type=int, default=600)
+    run.add_argument('--warmup', type=int, default=120)
+    run.add_argument('--seed', type=int, default=1234)
+    run.add_argument('--out', default=None)
+    run.add_argument('--gc', action='store_true', help="kare farkındalıklı GC yönetimiyle koştur")
+    
+    compare = commands.add_parser('compare', help="iki sonucu karşılaştır")
+    compare.add_argument('base')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.10)
+    compare.add_argument('--min-ms', type=float, default=0.05)
+    
+    micro = commands.add_parser('micro', help="sıcak fonksiyonlar için ölçekleme eğrileri")
+    micro.add_argument('--target', action='append', choices=list(MICRO_TARGETS))
+    micro.add_argument('--sizes', default="10,30,100,300,1000")
+    micro.add_argument('--repeat', type=int, default=50)
+    micro.add_argument('--seed', type=int, default=1234)
+    micro.add_argument('--out', default=None)
+    
+    commands.add_parser('list', help="senaryoları listele")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'list':
+        for name in BENCH_SCENARIOS:
+            print(name)
+        for name in MICRO_TARGETS:
+            print(f"micro: {name}")
+        return 0
+    
+    if args.command == 'micro':
+        sizes = [int(size) for size in args.sizes.split(',')]
+        report = {'meta': bench_meta(args.seed, args.repeat, 0), 'targets': {}}
+        for name in args.target or MICRO_TARGETS:
+            result = run_micro(name, sizes, args.repeat, args.seed)
+            report['targets'][name] = result
+            curve = "  ".join(f"{p['n']}:{p['p50']:.3f}" + (f"({p['items']})" if p['items'] != p['n'] else "")
+                              for p in result['points'])
+            print(f"{name:<18} exp={result['exponent']}  {curve}", file=sys.stderr)
+        text = json.dumps(report, indent=2)
+        if args.out:
+            with open(args.out, 'w') as f:
+                f.write(text)
+        print(text)
+        return 0
+    
+    if args.command == 'compare':
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        rows, regressions = bench_compare(base, new, args.threshold, args.min_ms)
+        for row in rows:
+            flag = "REGRESSION" if row in regressions else "ok"
+            print(f"{row['scenario']:<34} {row['phase']:<10} {row['stat']:<4} "
+                  f"{row['base']:>9.3f} -> {row['new']:>9.3f} ms "
+                  f"{row['change'] * 100:+7.1f}%  {flag}")
+        return 1 if regressions else 0
+    
+    if args.command != 'run':
+        parser.print_help()
+        return 2
+    
+    report = {'meta': bench_meta(args.seed, args.ticks, args.warmup), 'scenarios': {}}
+    for name in args.scenario or BENCH_SCENARIOS:
+        report['scenarios'][name] = run_benchmark(name, args.ticks, args.warmup, args.seed,
+                                                  gc_managed=args.gc)
+    
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    print(text)
+    return 0
+
 if __name__ == "__main__":
-    gm = GameManager()
+    if BENCHMARK:
+        code = bench_main(sys.argv[1:])
+        pygame.quit()
+        sys.exit(code)
+    
+    if HEADLESS:
+        code = headless_main(sys.argv[1:])
+        pygame.quit()
+        sys.exit(code)
+    
+    # --replay DOSYA: kaydı pencerede oynatır, canlı oyun girdisi yok sayılır
+    replay_player = None
+    if '--replay' in sys.argv:
+        replay_player = ReplayPlayer(Replay(argv_value('--replay')))
+        gm = replay_player.start(headless=False)
+        if argv_value('--seek'):
+            replay_player.seek(gm, int(argv_value('--seek')))
+    elif '--record' in sys.argv:
+        seed = rng_service.seed()
+        gm = GameManager()
+        path = argv_value('--record', datetime.datetime.now().strftime("matrix_replay_%Y%m%d_%H%M%S.mxr"))
+        gm.recorder = InputRecorder(path, seed)
+    else:
+        gm = GameManager()
+    if '--no-gc-manager' not in sys.argv:
+        gm.enable_gc_manager()
+    timestep = FixedTimestep()
     running = True
+    if '--trace' in sys.argv:
+        gm.toggle_trace()
+    if os.environ.get('MATRIX_HITCH_MS'):
+        gm.toggle_hitch_detector(float(os.environ['MATRIX_HITCH_MS']))
 
     while running:
+        gm.profiler.begin_frame()
+        
         # input
         keys = pygame.key.get_pressed()
-        for event in pygame.event.get():
+        with gm.profiler.section('events'):
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.VIDEORESIZE:
-                WIDTH, HEIGHT = event.w, event.h
-                screen = pygame.display.set_mode((WIDTH, HEIGHT),
-                                                pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.VIDEORESIZE and replay_player is None:
+                gm.resize(event.w, event.h)
+            elif event.type == pygame.MOUSEBUTTONDOWN and replay_player is None:
                 gm.handle_click(event.pos)
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_p:
-                    gm.state = GameState.PAUSED if gm.state == GameState.PLAYING else GameState.PLAYING
-                elif event.key == pygame.K_r and gm.state == GameState.GAME_OVER:
-                    gm.start_game()
-                elif gm.cutscene_manager.active_cutscene:
-                    # herhangi bir tuşa basınca cutscene atla/ileri
-                    gm.cutscene_manager.active_cutscene = None
+                if event.key == pygame.K_F2:
+                    gm.set_dirty_rect_mode(not gm.dirty_rect_mode)
+                elif event.key == pygame.K_F3:
+                    gm.toggle_profiler()
+                elif event.key == pygame.K_F5:
+                    detector = gm.toggle_hitch_detector()
+                    print(f"hitch watchdog: {'on' if detector else 'off'}")
+                elif event.key == pygame.K_F6:
+                    path = gm.toggle_memory_monitor()
+                    print(f"memory report: {path}" if path else "memory monitor: on")
+                elif event.key == pygame.K_F4:
+                    path = gm.toggle_trace()
+                    if path:
+                        print(f"trace: {path}")
+                elif replay_player is None:
+                    gm.handle_key(event.key)
+                else:
+                    replay_player.handle_key(gm, event.key)
 
         # update & render
-        gm.update(keys)
-        gm.draw(screen)
+        for _ in range(timestep.advance()):
+            if replay_player is None:
+                gm.tick(keys)
+            elif not replay_player.step(gm):
+                running = False
+                break
+        dirty = gm.draw(screen, timestep.alpha)
+        dirty = gm.draw_profiler(screen, dirty)
 
-        pygame.display.flip()
-        clock.tick(60)
+        with gm.profiler.section('flip'):
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+        gm.end_frame(timestep.remaining() * 1000)
+        with gm.profiler.span('clock.tick'):
+            clock.tick(MAX_RENDER_FPS)
 
+    if gm.profiler.tracer is not None:
+        print(f"trace: {gm.toggle_trace()}")
+    if gm.memory_monitor is not None:
+        print(f"memory report: {gm.toggle_memory_monitor()}")
+    if gm.recorder is not None:
+        print(f"replay: {gm.recorder.close(gm)}")
+    if replay_player is not None:
+        print(f"replay verified: {replay_player.verify(gm)}")
     pygame.quit()
     sys.exit()
\ No newline at end of file